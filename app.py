@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-import json
 import hashlib
+import orjson
 from utils.auth_manager import AuthManager
 from utils.course_manager import CourseManager
 from utils.ai_engine import AIEngine
@@ -18,6 +19,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@dataclass(slots=True)
+class User:
+    """Authenticated user stored in session state"""
+    user_id: str
+    username: str
+    email: str
+    preferences: dict = field(default_factory=dict)
+
+# Learning preference options
+LEARNING_STYLES = ("Visual", "Auditory", "Kinesthetic", "Reading/Writing")
+DIFFICULTIES = ("Beginner", "Intermediate", "Advanced", "Mixed")
+STUDY_TIMES = ("15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours")
+INTERESTS = ("Technology", "Science", "Mathematics", "Languages", "Business", "Arts", "History")
+
+_LEARNING_STYLE_INDEX = {value: i for i, value in enumerate(LEARNING_STYLES)}
+_DIFFICULTY_INDEX = {value: i for i, value in enumerate(DIFFICULTIES)}
+_STUDY_TIME_INDEX = {value: i for i, value in enumerate(STUDY_TIMES)}
+
+# Enrolled courses shown per page in My Learning
+COURSES_PER_PAGE = 10
+
 # Initialize session state
 if 'user' not in st.session_state:
     st.session_state.user = None
@@ -28,19 +50,80 @@ if 'learning_preferences' not in st.session_state:
 if 'user_progress' not in st.session_state:
     st.session_state.user_progress = {}
 
+@st.cache_resource
+def get_auth_manager():
+    """Shared AuthManager instance for the app lifetime"""
+    return AuthManager()
+
+@st.cache_resource
+def get_course_manager():
+    """Shared CourseManager instance for the app lifetime"""
+    return CourseManager()
+
+@st.cache_resource
+def get_ai_engine():
+    """Shared AIEngine instance for the app lifetime"""
+    return AIEngine(get_course_manager())
+
+@st.cache_resource
+def get_progress_tracker():
+    """Shared ProgressTracker instance for the app lifetime"""
+    return ProgressTracker(get_course_manager())
+
+@st.cache_resource
+def get_quiz_generator():
+    """Shared QuizGenerator instance for the app lifetime"""
+    return QuizGenerator(get_progress_tracker())
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_categories(catalog_version):
+    """Cache the course category list for one catalog version"""
+    return get_course_manager().get_categories()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_search(query, category, difficulty, catalog_version):
+    """Cache course search results keyed on the filter values and catalog version"""
+    return get_course_manager().search_courses(query, category, difficulty)
+
+def _preferences_key(preferences):
+    """Convert a preferences dict into a hashable, order-independent key"""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in preferences.items()
+    ))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_recommendations(user_id, preferences_key):
+    """Cache personalized recommendations across reruns"""
+    return get_ai_engine().get_personalized_recommendations(user_id, dict(preferences_key))
+
+def get_recommendations(user_id, preferences):
+    """Get personalized recommendations, cached per user and preferences for the cache TTL"""
+    return _cached_recommendations(user_id, _preferences_key(preferences))
+
+def clear_recommendations():
+    """Invalidate cached recommendations after enrollments or preference changes"""
+    _cached_recommendations.clear()
+    if st.session_state.get('user') is not None:
+        get_ai_engine().invalidate_recommendations(st.session_state.user.user_id)
+
 def main():
     # Initialize managers
-    auth_manager = AuthManager()
-    course_manager = CourseManager()
-    ai_engine = AIEngine()
-    progress_tracker = ProgressTracker()
-    quiz_generator = QuizGenerator()
+    auth_manager = get_auth_manager()
+    course_manager = get_course_manager()
+    ai_engine = get_ai_engine()
+    progress_tracker = get_progress_tracker()
+    quiz_generator = get_quiz_generator()
     
     # Check authentication
-    if st.session_state.user is None:
-        show_auth_page(auth_manager)
-    else:
-        show_main_app(course_manager, ai_engine, progress_tracker, quiz_generator, auth_manager)
+    try:
+        if st.session_state.user is None:
+            show_auth_page(auth_manager)
+        else:
+            show_main_app(course_manager, ai_engine, progress_tracker, quiz_generator, auth_manager)
+    finally:
+        # Progress changes made during this run are written once, even when it ends in st.rerun()
+        progress_tracker.flush()
 
 def show_auth_page(auth_manager):
     """Display authentication page"""
@@ -61,7 +144,7 @@ def show_auth_page(auth_manager):
             if st.button("Login", type="primary", use_container_width=True):
                 user = auth_manager.authenticate_user(username, password)
                 if user:
-                    st.session_state.user = user
+                    st.session_state.user = User(**user)
                     st.session_state.learning_preferences = user.get('preferences', {})
                     st.success("Login successful!")
                     st.rerun()
@@ -83,24 +166,24 @@ def show_auth_page(auth_manager):
             with col_a:
                 learning_style = st.selectbox(
                     "Learning Style",
-                    ["Visual", "Auditory", "Kinesthetic", "Reading/Writing"],
+                    LEARNING_STYLES,
                     key="signup_style"
                 )
                 difficulty_preference = st.selectbox(
                     "Preferred Difficulty",
-                    ["Beginner", "Intermediate", "Advanced", "Mixed"],
+                    DIFFICULTIES,
                     key="signup_difficulty"
                 )
             
             with col_b:
                 study_time = st.selectbox(
                     "Daily Study Time",
-                    ["15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours"],
+                    STUDY_TIMES,
                     key="signup_time"
                 )
                 interests = st.multiselect(
                     "Subject Interests",
-                    ["Technology", "Science", "Mathematics", "Languages", "Business", "Arts", "History"],
+                    list(INTERESTS),
                     key="signup_interests"
                 )
             
@@ -121,7 +204,7 @@ def show_auth_page(auth_manager):
                     
                     user = auth_manager.create_user(new_username, new_email, new_password, preferences)
                     if user:
-                        st.session_state.user = user
+                        st.session_state.user = User(**user)
                         st.session_state.learning_preferences = preferences
                         st.success("Account created successfully!")
                         st.rerun()
@@ -134,7 +217,7 @@ def show_main_app(course_manager, ai_engine, progress_tracker, quiz_generator, a
     
     # Sidebar
     with st.sidebar:
-        st.title(f"Welcome, {user['username']}!")
+        st.title(f"Welcome, {user.username}!")
         
         # Navigation
         page = st.selectbox(
@@ -145,7 +228,7 @@ def show_main_app(course_manager, ai_engine, progress_tracker, quiz_generator, a
         st.divider()
         
         # Quick stats
-        user_progress = progress_tracker.get_user_progress(user['user_id'])
+        user_progress = progress_tracker.get_user_progress(user.user_id)
         st.metric("Courses Enrolled", len(user_progress.get('enrolled_courses', [])))
         st.metric("Completed Lessons", user_progress.get('completed_lessons', 0))
         st.metric("Learning Streak", user_progress.get('streak_days', 0))
@@ -173,24 +256,79 @@ def show_main_app(course_manager, ai_engine, progress_tracker, quiz_generator, a
     elif page == "Settings":
         show_settings(auth_manager)
 
+def daily_goal_ratio(time_today, daily_goal):
+    """Fraction of the daily study goal completed, capped at 1.0"""
+    return min(time_today / daily_goal, 1.0) if daily_goal > 0 else 0.0
+
+def course_progress_frame(courses_by_id, course_progress_map):
+    """Completion percentage per course, indexed by course title"""
+    return pd.DataFrame({
+        'Course': [course['title'] for course in courses_by_id.values()],
+        'Progress (%)': [course_progress_map.get(course_id, 0) for course_id in courses_by_id]
+    }).set_index('Course')
+
+def show_course_progress_chart(courses_by_id, course_progress_map):
+    """Render completion percentage for several courses as one bar chart"""
+    st.bar_chart(course_progress_frame(courses_by_id, course_progress_map), horizontal=True)
+
+def get_progress_frames(user_id, progress_data):
+    """Build the progress tab frames, reusing the last ones while their inputs are unchanged"""
+    daily_study_time = progress_data.get('daily_study_time') or {}
+    course_progress = progress_data.get('course_progress') or {}
+    achievements = progress_data.get('achievements') or []
+    
+    frames_key = hashlib.blake2b(
+        orjson.dumps(
+            {'u': user_id, 'd': daily_study_time, 'c': course_progress, 'a': achievements},
+            option=orjson.OPT_SORT_KEYS
+        ),
+        digest_size=8
+    ).hexdigest()
+    
+    if st.session_state.get('progress_frames_key') == frames_key:
+        return st.session_state.progress_frames
+    
+    frames = {'trend': None, 'course_progress': None, 'achievements': None}
+    
+    if daily_study_time:
+        num_days = len(daily_study_time)
+        
+        # Keys are ISO dates, so both axes can be filled without intermediate lists
+        frames['trend'] = pd.Series(
+            np.fromiter(daily_study_time.values(), dtype=np.int32, count=num_days),
+            index=pd.DatetimeIndex(np.fromiter(daily_study_time.keys(), dtype='datetime64[D]', count=num_days)),
+            name='Study Time (minutes)'
+        )
+    
+    if course_progress:
+        courses_by_id = get_course_manager().get_courses(list(course_progress.keys()))
+        frames['course_progress'] = course_progress_frame(courses_by_id, course_progress)
+    
+    if achievements:
+        frames['achievements'] = pd.DataFrame(achievements, columns=['icon', 'title', 'description', 'date'])
+    
+    st.session_state.progress_frames = frames
+    st.session_state.progress_frames_key = frames_key
+    return frames
+
 def show_dashboard(course_manager, ai_engine, progress_tracker):
     """Display user dashboard"""
     st.title("📊 Your Learning Dashboard")
     
     user = st.session_state.user
-    user_progress = progress_tracker.get_user_progress(user['user_id'])
+    user_progress = progress_tracker.get_user_progress(user.user_id)
     
     # Welcome message and daily goal
     col1, col2, col3 = st.columns([2, 1, 1])
     
     with col1:
-        st.markdown(f"### Good day, {user['username']}! 👋")
+        st.markdown(f"### Good day, {user.username}! 👋")
         daily_goal = user_progress.get('daily_goal_minutes', 30)
         time_today = user_progress.get('time_studied_today', 0)
         
-        progress_pct = min(time_today / daily_goal * 100, 100) if daily_goal > 0 else 0
-        st.progress(progress_pct / 100)
-        st.write(f"Daily Goal: {time_today}/{daily_goal} minutes ({progress_pct:.0f}%)")
+        goal_ratio = daily_goal_ratio(time_today, daily_goal)
+        st.progress(goal_ratio)
+        st.write(f"Daily Goal: {time_today}/{daily_goal} minutes ({goal_ratio:.0%})")
     
     with col2:
         st.metric("Total Points", user_progress.get('total_points', 0))
@@ -205,19 +343,15 @@ def show_dashboard(course_manager, ai_engine, progress_tracker):
         st.subheader("🔥 Continue Learning")
         
         enrolled_courses = user_progress.get('enrolled_courses', [])
+        course_progress_map = user_progress.get('course_progress', {})
         if enrolled_courses:
-            for course_id in enrolled_courses[:3]:
-                course = course_manager.get_course(course_id)
-                if course:
-                    with st.container():
-                        st.write(f"**{course['title']}**")
-                        course_progress = user_progress.get('course_progress', {}).get(course_id, 0)
-                        st.progress(course_progress / 100)
-                        st.write(f"Progress: {course_progress}%")
-                        
-                        if st.button(f"Continue", key=f"continue_{course_id}"):
-                            st.session_state.current_course = course_id
-                            st.rerun()
+            courses_by_id = course_manager.get_courses(enrolled_courses[:3])
+            show_course_progress_chart(courses_by_id, course_progress_map)
+            
+            for course_id, course in courses_by_id.items():
+                if st.button(f"Continue {course['title']}", key=f"continue_{course_id}"):
+                    st.session_state.current_course = course_id
+                    st.rerun()
         else:
             st.info("No courses enrolled yet. Browse courses to get started!")
     
@@ -225,13 +359,14 @@ def show_dashboard(course_manager, ai_engine, progress_tracker):
         st.subheader("🤖 AI Recommendations")
         
         # Get AI recommendations
-        recommendations = ai_engine.get_personalized_recommendations(
-            user['user_id'], 
+        recommendations = get_recommendations(
+            user.user_id, 
             st.session_state.learning_preferences
         )
         
+        rec_courses = course_manager.get_courses([rec['course_id'] for rec in recommendations[:3]])
         for rec in recommendations[:3]:
-            course = course_manager.get_course(rec['course_id'])
+            course = rec_courses.get(rec['course_id'])
             if course:
                 with st.container():
                     st.write(f"**{course['title']}**")
@@ -245,6 +380,7 @@ def show_dashboard(course_manager, ai_engine, progress_tracker):
 def show_course_browser(course_manager, ai_engine):
     """Display course browser with filtering and search"""
     st.title("📚 Browse Courses")
+    catalog_version = course_manager.catalog_version
     
     # Search and filters
     col1, col2, col3 = st.columns([2, 1, 1])
@@ -255,7 +391,7 @@ def show_course_browser(course_manager, ai_engine):
     with col2:
         category_filter = st.selectbox(
             "Category",
-            ["All"] + course_manager.get_categories()
+            ("All",) + _cached_categories(catalog_version)
         )
     
     with col3:
@@ -265,35 +401,45 @@ def show_course_browser(course_manager, ai_engine):
         )
     
     # Get filtered courses
-    courses = course_manager.search_courses(search_query, category_filter, difficulty_filter)
+    courses = _cached_search(search_query, category_filter, difficulty_filter, catalog_version)
     
     # Display courses
     if courses:
-        for i in range(0, len(courses), 2):
-            cols = st.columns(2)
+        courses_df = pd.DataFrame(courses)[
+            ['title', 'category', 'difficulty', 'estimated_hours', 'rating', 'description']
+        ]
+        
+        selection = st.dataframe(
+            courses_df,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            column_config={
+                'title': st.column_config.TextColumn("Course"),
+                'category': "Category",
+                'difficulty': "Difficulty",
+                'estimated_hours': st.column_config.NumberColumn("Duration", format="%d hours"),
+                'rating': st.column_config.ProgressColumn("Rating", format="%.1f/5", min_value=0, max_value=5),
+                'description': st.column_config.TextColumn("Description", width="large")
+            },
+            key="course_browser_table"
+        )
+        
+        # Only the selected course gets action widgets
+        if selection.selection.rows:
+            course = courses[selection.selection.rows[0]]
             
-            for j, col in enumerate(cols):
-                if i + j < len(courses):
-                    course = courses[i + j]
-                    
-                    with col:
-                        with st.container():
-                            st.subheader(course['title'])
-                            st.write(f"**Category:** {course['category']}")
-                            st.write(f"**Difficulty:** {course['difficulty']}")
-                            st.write(f"**Duration:** {course['estimated_hours']} hours")
-                            st.write(f"**Rating:** {'⭐' * int(course.get('rating', 0))} ({course.get('rating', 0)}/5)")
-                            
-                            st.write(course['description'])
-                            
-                            col_a, col_b = st.columns(2)
-                            with col_a:
-                                if st.button("View Details", key=f"view_details_{course['course_id']}"):
-                                    show_course_details(course, course_manager)
-                            
-                            with col_b:
-                                if st.button("Enroll", key=f"enroll_{course['course_id']}", type="primary"):
-                                    enroll_in_course(course['course_id'], course_manager)
+            col_a, col_b = st.columns(2)
+            with col_a:
+                if st.button("View Details", key=f"view_details_{course['course_id']}"):
+                    show_course_details(course, course_manager)
+            
+            with col_b:
+                if st.button("Enroll", key=f"enroll_{course['course_id']}", type="primary"):
+                    enroll_in_course(course['course_id'], course_manager)
+        else:
+            st.caption("Select a course to view details or enroll.")
     else:
         st.info("No courses found matching your criteria.")
 
@@ -328,7 +474,8 @@ def enroll_in_course(course_id, course_manager):
     """Enroll user in a course"""
     user = st.session_state.user
     
-    if course_manager.enroll_user(user['user_id'], course_id):
+    if course_manager.enroll_user(user.user_id, course_id):
+        clear_recommendations()
         st.success("Successfully enrolled in the course!")
         st.rerun()
     else:
@@ -339,70 +486,77 @@ def show_my_learning(course_manager, progress_tracker):
     st.title("📖 My Learning")
     
     user = st.session_state.user
-    user_progress = progress_tracker.get_user_progress(user['user_id'])
+    user_progress = progress_tracker.get_user_progress(user.user_id)
     enrolled_courses = user_progress.get('enrolled_courses', [])
     
     if not enrolled_courses:
         st.info("You haven't enrolled in any courses yet. Browse courses to get started!")
         return
     
+    # Paginate so per-rerun work stays bounded
+    total_pages = (len(enrolled_courses) + COURSES_PER_PAGE - 1) // COURSES_PER_PAGE
+    if total_pages > 1:
+        page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+        st.caption(f"Page {page_number} of {total_pages}")
+    else:
+        page_number = 1
+    
+    start = (page_number - 1) * COURSES_PER_PAGE
+    enrolled_courses = enrolled_courses[start:start + COURSES_PER_PAGE]
+    
+    courses_by_id = course_manager.get_courses(enrolled_courses)
+    lessons_by_course = course_manager.get_lessons_for_courses(enrolled_courses)
+    course_progress_map = user_progress.get('course_progress', {})
+    completed_lessons_map = user_progress.get('completed_lessons_by_course', {})
+    time_spent_map = user_progress.get('time_spent_by_course', {})
+    
     # Display enrolled courses
     for course_id in enrolled_courses:
-        course = course_manager.get_course(course_id)
+        course = courses_by_id.get(course_id)
         if course:
             with st.expander(f"📚 {course['title']}", expanded=True):
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    course_progress = user_progress.get('course_progress', {}).get(course_id, 0)
+                    course_progress = course_progress_map.get(course_id, 0)
                     st.progress(course_progress / 100)
                     st.write(f"Progress: {course_progress}%")
                     
                     # Display lessons
-                    lessons = course_manager.get_course_lessons(course_id)
-                    completed_lessons = user_progress.get('completed_lessons_by_course', {}).get(course_id, [])
+                    lessons = lessons_by_course.get(course_id, [])
+                    completed_lessons = completed_lessons_map.get(course_id, [])
                     
-                    for lesson in lessons:
-                        is_completed = lesson['lesson_id'] in completed_lessons
-                        status_icon = "✅" if is_completed else "⏳"
-                        
-                        col_a, col_b = st.columns([3, 1])
-                        with col_a:
-                            st.write(f"{status_icon} {lesson['title']}")
-                        with col_b:
-                            if not is_completed:
-                                if st.button("Start", key=f"start_{lesson['lesson_id']}"):
-                                    start_lesson(lesson, course_id, progress_tracker)
-                            else:
-                                st.write("✓ Done")
+                    lessons_df = pd.DataFrame(lessons, columns=['lesson_id', 'title', 'duration_minutes'])
+                    lessons_df['done'] = lessons_df['lesson_id'].isin(completed_lessons)
+                    
+                    edited = st.data_editor(
+                        lessons_df,
+                        column_config={
+                            'lesson_id': None,
+                            'title': "Lesson",
+                            'duration_minutes': st.column_config.NumberColumn("Duration", format="%d min"),
+                            'done': st.column_config.CheckboxColumn("Done")
+                        },
+                        disabled=['lesson_id', 'title', 'duration_minutes'],
+                        hide_index=True,
+                        use_container_width=True,
+                        key=f"lessons_{course_id}"
+                    )
+                    
+                    # Mark newly checked lessons as completed
+                    newly_completed = edited.loc[edited['done'] & ~lessons_df['done'], 'lesson_id']
+                    if not newly_completed.empty:
+                        for lesson_id in newly_completed:
+                            progress_tracker.complete_lesson(user.user_id, course_id, lesson_id)
+                        st.success("Lesson completed! Great job!")
+                        st.rerun()
                 
                 with col2:
                     st.metric("Lessons Completed", f"{len(completed_lessons)}/{len(lessons)}")
                     
-                    time_spent = user_progress.get('time_spent_by_course', {}).get(course_id, 0)
+                    time_spent = time_spent_map.get(course_id, 0)
                     st.metric("Time Spent", f"{time_spent} min")
 
-def start_lesson(lesson, course_id, progress_tracker):
-    """Start a lesson"""
-    st.session_state.current_lesson = lesson
-    st.session_state.current_course = course_id
-    
-    # Display lesson content
-    st.subheader(f"📝 {lesson['title']}")
-    
-    # Lesson content (this would typically be rich content)
-    st.write(lesson.get('content', 'Lesson content would be displayed here.'))
-    
-    # Mark as completed
-    if st.button("Mark as Completed", type="primary"):
-        progress_tracker.complete_lesson(
-            st.session_state.user['user_id'],
-            course_id,
-            lesson['lesson_id']
-        )
-        st.success("Lesson completed! Great job!")
-        st.rerun()
-
 def show_ai_recommendations(ai_engine, course_manager):
     """Display AI-powered course recommendations"""
     st.title("🤖 AI-Powered Recommendations")
@@ -411,13 +565,15 @@ def show_ai_recommendations(ai_engine, course_manager):
     preferences = st.session_state.learning_preferences
     
     # Get personalized recommendations
-    recommendations = ai_engine.get_personalized_recommendations(user['user_id'], preferences)
+    recommendations = get_recommendations(user.user_id, preferences)
     
     if recommendations:
         st.subheader("Recommended for You")
         
+        courses_by_id = course_manager.get_courses([rec['course_id'] for rec in recommendations])
+        
         for rec in recommendations:
-            course = course_manager.get_course(rec['course_id'])
+            course = courses_by_id.get(rec['course_id'])
             if course:
                 with st.container():
                     col1, col2 = st.columns([3, 1])
@@ -474,17 +630,20 @@ def show_quizzes(quiz_generator, course_manager):
                     
                     if quiz:
                         st.session_state.current_quiz = quiz
+                        st.session_state.quiz_answers = {}
                         st.success("Quiz generated successfully!")
-                        show_quiz_interface(quiz, quiz_generator)
                     else:
                         st.error("Failed to generate quiz. Please try again or check your topic.")
             else:
                 st.warning("Please enter a quiz topic.")
+        
+        if 'current_quiz' in st.session_state:
+            show_quiz_interface(st.session_state.current_quiz, quiz_generator)
     
     with tab2:
         st.subheader("Your Quiz History")
         
-        quiz_history = quiz_generator.get_user_quiz_history(user['user_id'])
+        quiz_history = quiz_generator.get_user_quiz_history(user.user_id)
         
         if quiz_history:
             for quiz_record in quiz_history:
@@ -503,32 +662,34 @@ def show_quiz_interface(quiz, quiz_generator):
     if 'quiz_answers' not in st.session_state:
         st.session_state.quiz_answers = {}
     
-    # Display questions
-    for i, question in enumerate(quiz['questions']):
-        st.write(f"**Question {i+1}:** {question['question']}")
-        
-        if question['type'] == 'multiple_choice':
-            answer = st.radio(
-                f"Select your answer:",
-                question['options'],
-                key=f"q_{i}",
-                index=None
-            )
-            st.session_state.quiz_answers[i] = answer
+    # Answers are collected in a form so only the submit triggers a rerun
+    with st.form("quiz_form"):
+        for i, question in enumerate(quiz['questions']):
+            st.write(f"**Question {i+1}:** {question['question']}")
             
-        elif question['type'] == 'true_false':
-            answer = st.radio(
-                f"True or False?",
-                ["True", "False"],
-                key=f"q_{i}",
-                index=None
-            )
-            st.session_state.quiz_answers[i] = answer
+            if question['type'] == 'multiple_choice':
+                answer = st.radio(
+                    f"Select your answer:",
+                    question['options'],
+                    key=f"q_{i}",
+                    index=None
+                )
+                st.session_state.quiz_answers[i] = answer
+                
+            elif question['type'] == 'true_false':
+                answer = st.radio(
+                    f"True or False?",
+                    ["True", "False"],
+                    key=f"q_{i}",
+                    index=None
+                )
+                st.session_state.quiz_answers[i] = answer
+            
+            st.divider()
         
-        st.divider()
+        submitted = st.form_submit_button("Submit Quiz", type="primary")
     
-    # Submit quiz
-    if st.button("Submit Quiz", type="primary"):
+    if submitted:
         score = quiz_generator.calculate_score(quiz, st.session_state.quiz_answers)
         
         st.success(f"Quiz completed! Your score: {score['percentage']}%")
@@ -536,7 +697,7 @@ def show_quiz_interface(quiz, quiz_generator):
         
         # Save quiz result
         quiz_generator.save_quiz_result(
-            st.session_state.user['user_id'],
+            st.session_state.user.user_id,
             quiz,
             st.session_state.quiz_answers,
             score
@@ -551,7 +712,7 @@ def show_progress_tracking(progress_tracker):
     st.title("📈 Progress Tracking")
     
     user = st.session_state.user
-    progress_data = progress_tracker.get_detailed_progress(user['user_id'])
+    progress_data = progress_tracker.get_detailed_progress(user.user_id)
     
     # Progress overview
     col1, col2, col3, col4 = st.columns(4)
@@ -568,55 +729,42 @@ def show_progress_tracking(progress_tracker):
     with col4:
         st.metric("Achievement Points", progress_data.get('total_points', 0))
     
-    # Progress charts
+    # Progress charts; all tabs run on every rerun, so their frames are only rebuilt on change
+    progress_frames = get_progress_frames(user.user_id, progress_data)
     tab1, tab2, tab3 = st.tabs(["Learning Trends", "Course Progress", "Achievements"])
     
     with tab1:
         st.subheader("📊 Learning Trends")
         
         # Daily study time chart
-        if progress_data.get('daily_study_time'):
-            dates = list(progress_data['daily_study_time'].keys())
-            times = list(progress_data['daily_study_time'].values())
-            
-            chart_data = pd.DataFrame({
-                'Date': pd.to_datetime(dates),
-                'Study Time (minutes)': times
-            })
-            
-            st.line_chart(chart_data.set_index('Date'))
+        if progress_frames['trend'] is not None:
+            st.line_chart(progress_frames['trend'])
         else:
             st.info("Start learning to see your progress trends!")
     
     with tab2:
         st.subheader("📚 Course Progress")
         
-        course_progress = progress_data.get('course_progress', {})
-        if course_progress:
-            for course_id, progress in course_progress.items():
-                course_manager = CourseManager()
-                course = course_manager.get_course(course_id)
-                if course:
-                    st.write(f"**{course['title']}**")
-                    st.progress(progress / 100)
-                    st.write(f"{progress}% completed")
+        if progress_frames['course_progress'] is not None:
+            st.bar_chart(progress_frames['course_progress'], horizontal=True)
         else:
             st.info("Enroll in courses to track your progress!")
     
     with tab3:
         st.subheader("🏆 Achievements")
         
-        achievements = progress_data.get('achievements', [])
-        if achievements:
-            for achievement in achievements:
-                with st.container():
-                    col1, col2 = st.columns([1, 4])
-                    with col1:
-                        st.write(achievement['icon'])
-                    with col2:
-                        st.write(f"**{achievement['title']}**")
-                        st.write(achievement['description'])
-                        st.write(f"Earned: {achievement['date']}")
+        if progress_frames['achievements'] is not None:
+            st.dataframe(
+                progress_frames['achievements'],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'icon': st.column_config.TextColumn("", width="small"),
+                    'title': "Achievement",
+                    'description': "Description",
+                    'date': "Earned"
+                }
+            )
         else:
             st.info("Keep learning to earn achievements!")
 
@@ -637,32 +785,32 @@ def show_settings(auth_manager):
             with col1:
                 learning_style = st.selectbox(
                     "Learning Style",
-                    ["Visual", "Auditory", "Kinesthetic", "Reading/Writing"],
-                    index=["Visual", "Auditory", "Kinesthetic", "Reading/Writing"].index(
-                        st.session_state.learning_preferences.get('learning_style', 'Visual')
+                    LEARNING_STYLES,
+                    index=_LEARNING_STYLE_INDEX.get(
+                        st.session_state.learning_preferences.get('learning_style'), 0
                     )
                 )
                 
                 difficulty_preference = st.selectbox(
                     "Preferred Difficulty",
-                    ["Beginner", "Intermediate", "Advanced", "Mixed"],
-                    index=["Beginner", "Intermediate", "Advanced", "Mixed"].index(
-                        st.session_state.learning_preferences.get('difficulty_preference', 'Beginner')
+                    DIFFICULTIES,
+                    index=_DIFFICULTY_INDEX.get(
+                        st.session_state.learning_preferences.get('difficulty_preference'), 0
                     )
                 )
             
             with col2:
                 study_time = st.selectbox(
                     "Daily Study Time",
-                    ["15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours"],
-                    index=["15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours"].index(
-                        st.session_state.learning_preferences.get('study_time', '30-60 minutes')
+                    STUDY_TIMES,
+                    index=_STUDY_TIME_INDEX.get(
+                        st.session_state.learning_preferences.get('study_time'), 1
                     )
                 )
                 
                 interests = st.multiselect(
                     "Subject Interests",
-                    ["Technology", "Science", "Mathematics", "Languages", "Business", "Arts", "History"],
+                    list(INTERESTS),
                     default=st.session_state.learning_preferences.get('interests', [])
                 )
             
@@ -682,8 +830,9 @@ def show_settings(auth_manager):
                     'daily_goal_minutes': daily_goal
                 }
                 
-                if auth_manager.update_user_preferences(user['user_id'], new_preferences):
+                if auth_manager.update_user_preferences(user.user_id, new_preferences):
                     st.session_state.learning_preferences = new_preferences
+                    clear_recommendations()
                     st.success("Preferences updated successfully!")
                 else:
                     st.error("Failed to update preferences.")
@@ -692,7 +841,7 @@ def show_settings(auth_manager):
         st.subheader("👤 Account Settings")
         
         with st.form("account_form"):
-            new_email = st.text_input("Email", value=user.get('email', ''))
+            new_email = st.text_input("Email", value=user.email)
             
             st.write("**Change Password**")
             current_password = st.text_input("Current Password", type="password")
@@ -705,7 +854,7 @@ def show_settings(auth_manager):
                 elif new_password and len(new_password) < 6:
                     st.error("Password must be at least 6 characters")
                 else:
-                    if auth_manager.update_user_account(user['user_id'], new_email, current_password, new_password):
+                    if auth_manager.update_user_account(user.user_id, new_email, current_password, new_password):
                         st.success("Account updated successfully!")
                     else:
                         st.error("Failed to update account. Check your current password.")
@@ -0,0 +1,52 @@
+import base64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.chart_generator import ChartGenerator
+
+CONFIG = {'title': 'Test', 'height': 400, 'template': 'plotly_white'}
+
+
+def _y_values(trace):
+    # Figures served from the cache carry their arrays base64-encoded
+    y = trace.y
+    if isinstance(y, dict):
+        y = np.frombuffer(base64.b64decode(y['bdata']), dtype=y['dtype'])
+    return np.asarray(y, dtype=float)
+
+
+def _trend_lines(fig):
+    return [trace for trace in fig.data if trace.name == 'Trend Line']
+
+
+def test_scatter_trend_line_ignores_missing_pairs():
+    data = pd.DataFrame({
+        'x': [0.0, 1.0, np.nan, 3.0, 4.0],
+        'y': [1.0, 3.0, 100.0, np.nan, 9.0],
+    })
+    (trend,) = _trend_lines(ChartGenerator()._create_scatter_plot(data, 'x', 'y', None, CONFIG))
+    np.testing.assert_allclose(trend.x, [0.0, 4.0])
+    np.testing.assert_allclose(trend.y, [1.0, 9.0], rtol=1e-5)
+
+
+@pytest.mark.parametrize('x', [[np.nan, np.nan, 1.0], [np.nan, 2.0, np.nan]])
+def test_scatter_skips_trend_line_without_two_complete_pairs(x):
+    data = pd.DataFrame({'x': x, 'y': [1.0, np.nan, 2.0]})
+    assert not _trend_lines(ChartGenerator()._create_scatter_plot(data, 'x', 'y', None, CONFIG))
+
+
+def test_cached_chart_reflects_edits_to_large_frames():
+    rows = 60_000
+    data = pd.DataFrame({'category': np.array(['a', 'b'])[np.arange(rows) % 2], 'value': np.ones(rows)})
+    generator = ChartGenerator()
+    before = generator._build_chart(data, 'Bar Chart', 'category', 'value', None, 'Edited', 400)
+    
+    # Streamlit hashes only a 10k-row sample of frames this large; edit a row outside it
+    sampled = set(data.sample(n=10_000, random_state=0).index)
+    row = next(i for i in range(rows) if i not in sampled)
+    edited = data.copy()
+    edited.loc[row, 'value'] = 1_000.0
+    after = generator._build_chart(edited, 'Bar Chart', 'category', 'value', None, 'Edited', 400)
+    assert _y_values(after.data[0]).sum() == _y_values(before.data[0]).sum() + 999.0
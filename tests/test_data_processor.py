@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_processor import DataProcessor, _arrow_in_mask, _frame_fingerprint, float32_corr
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'small_int': np.arange(20, dtype=np.int8) % 5,
+        'value': np.arange(20, dtype=np.float64) % 4,
+        'label': [f'item {i % 3}' for i in range(20)],
+    })
+
+
+@pytest.mark.parametrize('column, values', [
+    ('small_int', [1, 1000]),
+    ('small_int', [1.5, 2]),
+    ('value', ['3.0']),
+    ('value', [3, 'x']),
+    ('label', ['item 1', 7]),
+    ('label', []),
+])
+def test_in_mask_matches_isin_for_out_of_range_and_mixed_values(frame, column, values):
+    expected = frame[column].isin(values).to_numpy()
+    np.testing.assert_array_equal(_arrow_in_mask(frame[column], values), expected)
+
+
+def test_in_filter_with_out_of_range_value_still_filters(frame):
+    filtered = DataProcessor().filter_data(frame, {'small_int': {'type': 'in', 'value': [1, 1000]}})
+    assert len(filtered) == 4
+    assert (filtered['small_int'] == 1).all()
+
+
+def test_fingerprint_changes_after_in_place_edit(frame):
+    before = _frame_fingerprint(frame)
+    frame['value'] *= 10
+    assert _frame_fingerprint(frame) != before
+
+
+def test_fingerprint_hashes_unhashable_cells_by_content():
+    first = pd.DataFrame({'tags': [['a'], ['b']]})
+    second = pd.DataFrame({'tags': [['a'], ['b']]})
+    assert _frame_fingerprint(first) == _frame_fingerprint(second)
+    first.at[0, 'tags'] = ['c']
+    assert _frame_fingerprint(first) != _frame_fingerprint(second)
+
+
+def test_float32_corr_matches_pandas(frame):
+    numeric = frame[['small_int', 'value']].assign(constant=1.0)
+    np.testing.assert_allclose(float32_corr(numeric).to_numpy(), numeric.corr().to_numpy(), atol=1e-6)
+
+
+@pytest.mark.parametrize('values, bounds', [
+    (['b', 'a', None, 'd', 'c', 'b'], ('b', 'c')),
+    ([3, 1, None, 4, 2, 3], (2, 3)),
+    # An all-missing categorical has an empty float dictionary that Arrow cannot compare with text bounds
+    ([None] * 6, ('a', 'z')),
+])
+def test_range_filter_on_categorical_column_compares_decoded_values(values, bounds):
+    data = pd.DataFrame({'kind': pd.Series(values, dtype='category'), 'row': range(len(values))})
+    filtered = DataProcessor().filter_data(data, {'kind': {'type': 'range', 'value': bounds}})
+    expected = pd.Series(values, dtype=object).map(lambda v: v is not None and bounds[0] <= v <= bounds[1])
+    assert filtered['row'].tolist() == data['row'][expected.to_numpy(dtype=bool)].tolist()
@@ -0,0 +1,50 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import export_manager
+from utils.export_manager import ExportManager
+
+
+@pytest.fixture
+def mixed_frame():
+    return pd.DataFrame({
+        'count': np.arange(6, dtype=np.int64),
+        'score': [1.5, np.nan, 3.25, 4.0, 0.1, 2.0],
+        'passed': [True, False, True, True, False, True],
+        'name': ['plain', 'with, comma', 'with "quote"', None, 'line\nbreak', 'last'],
+        'level': pd.Categorical(['a', 'b', 'a', 'c', 'b', 'a']),
+        # Midnight-only batches would print dates alone without the whole-column decision
+        'taken': pd.to_datetime(['2024-01-01 08:30', '2024-01-02', None, '2024-01-04', '2024-01-05', '2024-01-06'], format='ISO8601'),
+        'dates': pd.to_datetime(['2024-01-01', '2024-01-02', None, '2024-01-04', '2024-01-05', '2024-01-06']),
+        'precise': pd.to_datetime(['2024-01-01 00:00:00.5', '2024-01-02', '2024-01-03', None, '2024-01-05', '2024-01-06'], format='ISO8601'),
+        'aware': pd.date_range('2024-03-30 12:00', periods=6, freq='D', tz='Europe/Berlin'),
+        'aware_precise': pd.date_range('2024-01-01', periods=6, freq='500ms', tz='UTC'),
+        'duration': pd.to_timedelta(['1 days 01:00:00', '1 days', '2 days', None, '3 days', '4 days']),
+        'whole_days': pd.to_timedelta(['1 days', '2 days', None, '3 days', '4 days', '5 days']),
+    })
+
+
+@pytest.mark.parametrize('batch_rows', [1, 2, 4, 64_000])
+def test_csv_export_matches_whole_frame_output_across_batches(monkeypatch, mixed_frame, batch_rows):
+    monkeypatch.setattr(export_manager, 'EXPORT_BATCH_ROWS', batch_rows)
+    expected = mixed_frame.to_csv(index=False).encode()
+    assert ExportManager().export_data_to_csv(mixed_frame) == expected
+
+
+def test_csv_export_of_empty_frame_keeps_header(mixed_frame):
+    empty = mixed_frame.iloc[:0]
+    assert ExportManager().export_data_to_csv(empty) == empty.to_csv(index=False).encode()
+
+
+@pytest.mark.parametrize('batch_rows', [2, 64_000])
+def test_excel_export_round_trips_like_pandas(monkeypatch, mixed_frame, batch_rows):
+    monkeypatch.setattr(export_manager, 'EXPORT_BATCH_ROWS', batch_rows)
+    frame = mixed_frame.drop(columns=['aware', 'aware_precise', 'duration', 'whole_days'])
+    baseline = io.BytesIO()
+    frame.to_excel(baseline, sheet_name='Data', index=False)
+    
+    exported = pd.read_excel(io.BytesIO(ExportManager().export_data_to_excel(frame)), sheet_name='Data')
+    pd.testing.assert_frame_equal(exported, pd.read_excel(baseline, sheet_name='Data'))
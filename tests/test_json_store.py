@@ -0,0 +1,23 @@
+import os
+
+from utils.json_store import load_json_store, read_json_mapped
+
+
+def test_read_json_mapped_treats_empty_file_as_empty_store(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_bytes(b'')
+    assert read_json_mapped(str(path)) == {}
+
+
+def test_load_json_store_reuses_parse_until_file_changes(tmp_path):
+    path = tmp_path / 'store.json'
+    path.write_bytes(b'{"a": 1}')
+    first = load_json_store(str(path))
+    assert load_json_store(str(path)) is first
+    
+    path.write_bytes(b'{"a": 22}')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = load_json_store(str(path))
+    assert reloaded is not first
+    assert reloaded == {'a': 22}
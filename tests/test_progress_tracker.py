@@ -0,0 +1,43 @@
+import orjson
+
+from utils.progress_tracker import ProgressTracker
+
+
+def test_flush_keeps_dirty_flag_until_progress_is_written(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracker = ProgressTracker(course_manager=object())
+    tracker.user_progress['user'] = {'quiz_scores': []}
+    tracker._mark_progress_dirty()
+    
+    tracker.progress_file = str(tmp_path / 'missing' / 'user_progress.json')
+    tracker.flush()
+    assert tracker._progress_dirty
+    
+    tracker.progress_file = str(tmp_path / 'data' / 'user_progress.json')
+    tracker.flush()
+    assert not tracker._progress_dirty
+    assert orjson.loads((tmp_path / 'data' / 'user_progress.json').read_bytes()) == tracker.user_progress
+
+
+def test_quiz_result_is_recorded_in_the_shared_tracker_and_written(tmp_path, monkeypatch):
+    from utils.quiz_generator import QuizGenerator
+    
+    monkeypatch.chdir(tmp_path)
+    tracker = ProgressTracker(course_manager=object())
+    quiz = {'quiz_id': 'q1', 'topic': 'Python', 'difficulty': 'Beginner'}
+    QuizGenerator(tracker).save_quiz_result('user', quiz, {0: 'a'}, {'percentage': 95, 'correct': 1, 'total': 1})
+    
+    assert tracker.get_user_progress('user')['quiz_results'][0]['score'] == 95
+    assert not tracker._progress_dirty
+    saved = orjson.loads((tmp_path / 'data' / 'user_progress.json').read_bytes())
+    assert saved['user']['quiz_results'][0]['topic'] == 'Python'
+
+
+def test_exit_hook_does_not_keep_trackers_alive(tmp_path, monkeypatch):
+    import gc
+    import weakref
+    
+    monkeypatch.chdir(tmp_path)
+    tracker_ref = weakref.ref(ProgressTracker(course_manager=object()))
+    gc.collect()
+    assert tracker_ref() is None
@@ -1,59 +1,167 @@
-import json
+import atexit
+import bisect
+import hashlib
+import heapq
+import ijson
+import os
+import orjson
 import random
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
 import streamlit as st
+from .json_store import read_json_mapped
 from datetime import datetime, timedelta
 
+# Course hour ranges (exclusive, inclusive] that suit each preferred study session length
+STUDY_TIME_HOURS = {
+    '15-30 minutes': (-np.inf, 15),
+    '30-60 minutes': (15, 30),
+    '1-2 hours': (30, 50),
+    '2+ hours': (50, np.inf)
+}
+
+# Catalogs at least this large are scored in row chunks on a thread pool
+PARALLEL_SCORING_MIN_COURSES = 20_000
+
+# Cached recommendations are reused for this long while preferences are unchanged
+RECOMMENDATIONS_TTL_SECONDS = 600
+
+# Recommendation cache changes are written to disk at most this often
+FLUSH_INTERVAL_SECONDS = 2.0
+
+# Logged interactions are folded into the snapshot file after this many appends
+INTERACTIONS_COMPACT_EVERY = 500
+
+def _epoch_seconds(timestamp) -> int:
+    """Interaction timestamps are epoch seconds; older records stored ISO strings"""
+    if isinstance(timestamp, str):
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    return int(timestamp)
+
 class AIEngine:
     """Handles AI-powered personalization and recommendations"""
     
-    def __init__(self):
+    def __init__(self, course_manager=None):
+        self._course_manager = course_manager
         self.recommendations_file = "data/ai_recommendations.json"
         self.user_interactions_file = "data/user_interactions.json"
+        self.interactions_log_file = "data/user_interactions.jsonl"
         self._ensure_data_directory()
         self._load_data()
+        self._recommendations_dirty = False
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+    
+    def _get_course_manager(self):
+        """CourseManager shared by every call, created on first use"""
+        if self._course_manager is None:
+            from utils.course_manager import CourseManager
+            self._course_manager = CourseManager()
+        return self._course_manager
     
     def _ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
-        import os
         if not os.path.exists("data"):
             os.makedirs("data")
     
     def _load_data(self):
         """Load AI data from JSON files"""
         try:
-            with open(self.recommendations_file, 'r') as f:
-                self.recommendations_cache = json.load(f)
+            self.recommendations_cache = read_json_mapped(self.recommendations_file)
         except FileNotFoundError:
             self.recommendations_cache = {}
         
+        # Stream the snapshot one user at a time instead of holding the raw file in memory
+        self.user_interactions = {}
+        try:
+            with open(self.user_interactions_file, 'rb') as f:
+                for user_id, user_interactions in ijson.kvitems(f, '', use_float=True):
+                    self._migrate_timestamps(user_interactions)
+                    self.user_interactions[user_id] = user_interactions
+        except FileNotFoundError:
+            pass
+        
+        # Completion times per user, kept sorted for recency lookups
+        self._completion_ts = {
+            user_id: sorted(completion['timestamp'] for completion in user_interactions.get('completions', []))
+            for user_id, user_interactions in self.user_interactions.items()
+        }
+        
+        # Replay interactions appended since the last snapshot
+        self._logged_interactions = 0
         try:
-            with open(self.user_interactions_file, 'r') as f:
-                self.user_interactions = json.load(f)
+            with open(self.interactions_log_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        record = orjson.loads(line)
+                        self._apply_interaction(record['user_id'], record['type'], record['course_id'],
+                                                _epoch_seconds(record['ts']), record['metadata'])
+                        self._logged_interactions += 1
         except FileNotFoundError:
-            self.user_interactions = {}
+            pass
+    
+    def _write_json_atomic(self, path: str, data: Any):
+        """Write compact JSON to a temporary file and swap it into place"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
+        os.replace(tmp_path, path)
     
     def _save_recommendations(self):
         """Save recommendations cache to JSON file"""
         try:
-            with open(self.recommendations_file, 'w') as f:
-                json.dump(self.recommendations_cache, f, indent=2, default=str)
+            self._write_json_atomic(self.recommendations_file, self.recommendations_cache)
         except Exception as e:
             st.error(f"Error saving recommendations: {str(e)}")
     
-    def _save_interactions(self):
-        """Save user interactions to JSON file"""
+    def _save_interactions(self) -> bool:
+        """Save user interactions to JSON file, returning whether the write succeeded"""
         try:
-            with open(self.user_interactions_file, 'w') as f:
-                json.dump(self.user_interactions, f, indent=2, default=str)
+            self._write_json_atomic(self.user_interactions_file, self.user_interactions)
+            return True
         except Exception as e:
             st.error(f"Error saving interactions: {str(e)}")
+            return False
+    
+    def _maybe_flush(self):
+        """Write pending recommendation changes if the flush interval has passed"""
+        if self._recommendations_dirty and time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+    
+    def flush(self):
+        """Write pending recommendation changes and fold logged interactions into the snapshot"""
+        if self._recommendations_dirty:
+            self._save_recommendations()
+            self._recommendations_dirty = False
+        if self._logged_interactions:
+            self._compact_interactions()
+        self._last_flush = time.monotonic()
+    
+    def _compact_interactions(self):
+        """Write the interaction snapshot and truncate the append log once it is on disk"""
+        if not self._save_interactions():
+            return
+        try:
+            open(self.interactions_log_file, 'wb').close()
+            self._logged_interactions = 0
+        except Exception as e:
+            st.error(f"Error compacting interactions: {str(e)}")
     
     def get_personalized_recommendations(self, user_id: str, preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate personalized course recommendations"""
         try:
-            from utils.course_manager import CourseManager
-            course_manager = CourseManager()
+            # Reuse the last result while preferences are unchanged and it has not expired
+            preferences_hash = self._preferences_hash(preferences)
+            cached = self.recommendations_cache.get(user_id)
+            if cached and cached.get('preferences_hash') == preferences_hash:
+                age = datetime.now() - datetime.fromisoformat(cached['generated_at'])
+                if age.total_seconds() < RECOMMENDATIONS_TTL_SECONDS:
+                    return cached['recommendations']
+            
+            course_manager = self._get_course_manager()
             
             # Get user's enrolled courses to exclude from recommendations
             enrolled_courses = course_manager.get_user_enrollments(user_id)
@@ -61,168 +169,217 @@ class AIEngine:
             # Get user interactions for better personalization
             user_interactions = self.user_interactions.get(user_id, {})
             
-            # Get all courses
-            all_courses = course_manager.get_all_courses()
+            # Lowercase the interests once for every course comparison
+            interests = preferences.get('interests', [])
+            interests_lc = [interest.lower() for interest in interests]
             
+            # Score the whole catalog at once
+            features = course_manager.get_scoring_features()
             recommendations = []
             
-            for course in all_courses:
-                if course['course_id'] in enrolled_courses:
-                    continue
+            if features is not None:
+                scores, reasons = self._score_catalog(features, preferences, interests, interests_lc, user_interactions)
+                confidence = np.minimum(scores / 10.0, 1.0)  # Normalize to 0-1
                 
-                # Calculate recommendation score
-                score = self._calculate_recommendation_score(course, preferences, user_interactions)
+                eligible = np.flatnonzero((scores > 0) & ~np.isin(features['course_id'], enrolled_courses))
+                # Partial selection of the best ten; ties keep catalog order like a stable sort
+                top = heapq.nlargest(10, eligible.tolist(), key=confidence.__getitem__)
                 
-                if score > 0:
-                    recommendation = {
-                        'course_id': course['course_id'],
-                        'confidence': min(score / 10.0, 1.0),  # Normalize to 0-1
-                        'reason': self._generate_recommendation_reason(course, preferences, score)
-                    }
-                    recommendations.append(recommendation)
-            
-            # Sort by confidence score
-            recommendations.sort(key=lambda x: x['confidence'], reverse=True)
-            
-            # Cache recommendations
+                for i in top:
+                    recommendations.append({
+                        'course_id': features['course_id'][i],
+                        'confidence': float(confidence[i]),
+                        'reason': reasons[i]
+                    })
+            
+            # Cache recommendations, only rewriting the file when they changed
+            unchanged = (cached is not None and cached.get('preferences_hash') == preferences_hash
+                         and cached.get('recommendations') == recommendations)
             self.recommendations_cache[user_id] = {
-                'recommendations': recommendations[:10],
+                'recommendations': recommendations,
                 'generated_at': datetime.now().isoformat(),
-                'preferences_hash': hash(str(preferences))
+                'preferences_hash': preferences_hash
             }
-            self._save_recommendations()
+            if not unchanged:
+                self._recommendations_dirty = True
+            self._maybe_flush()
             
-            return recommendations[:10]
+            return recommendations
             
         except Exception as e:
             st.error(f"Error generating recommendations: {str(e)}")
             return []
     
-    def _calculate_recommendation_score(self, course: Dict[str, Any], preferences: Dict[str, Any], interactions: Dict[str, Any]) -> float:
-        """Calculate recommendation score for a course"""
-        score = 0.0
+    def _preferences_hash(self, preferences: Dict[str, Any]) -> str:
+        """Stable, order-independent digest of the preferences used to validate cached recommendations"""
+        return hashlib.blake2b(orjson.dumps(preferences, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    
+    def invalidate_recommendations(self, user_id: str):
+        """Drop a user's cached recommendations after enrollments or new interactions"""
+        self.recommendations_cache.pop(user_id, None)
+    
+    def _score_catalog(self, features: Dict[str, Any], preferences: Dict[str, Any], interests: List[str],
+                       interests_lc: List[str], interactions: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the catalog, splitting large catalogs into row chunks scored concurrently"""
+        num_courses = len(features['rating'])
+        num_chunks = min(os.cpu_count() or 1, num_courses // (PARALLEL_SCORING_MIN_COURSES // 4) or 1)
+        if num_courses < PARALLEL_SCORING_MIN_COURSES or num_chunks < 2:
+            return self._calculate_recommendation_scores(features, preferences, interests, interests_lc, interactions)
+        
+        # The string kernels and matrix product release the GIL, so chunks overlap on threads
+        bounds = np.linspace(0, num_courses, num_chunks + 1).astype(int)
+        chunks = [self._slice_features(features, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ThreadPoolExecutor(max_workers=num_chunks) as executor:
+            results = list(executor.map(
+                lambda chunk: self._calculate_recommendation_scores(chunk, preferences, interests, interests_lc, interactions),
+                chunks
+            ))
+        
+        return np.concatenate([scores for scores, _ in results]), np.concatenate([reasons for _, reasons in results])
+    
+    def _slice_features(self, features: Dict[str, Any], start: int, stop: int) -> Dict[str, Any]:
+        """Row range of the scoring features; the tag vocabulary is shared by every chunk"""
+        return {
+            key: value if key == 'tag_vocab' else (value.iloc[start:stop] if isinstance(value, pd.Series) else value[start:stop])
+            for key, value in features.items()
+        }
+    
+    def _calculate_recommendation_scores(self, features: Dict[str, Any], preferences: Dict[str, Any],
+                                         interests: List[str], interests_lc: List[str],
+                                         interactions: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate recommendation scores and the primary reason for every course in the catalog"""
+        rating = features['rating']
+        num_courses = len(rating)
         
         # Base score from course rating
-        score += course.get('rating', 0) * 2
+        scores = rating * 2
         
         # Score based on user interests
-        user_interests = preferences.get('interests', [])
-        course_tags = course.get('tags', [])
+        category_hits = []
+        tag_weights = np.zeros(len(features['tag_vocab']), dtype=np.int32)
+        for interest_lc in interests_lc:
+            # Interest matches course category
+            category_hit = features['category_lc'].str.contains(interest_lc, regex=False).to_numpy()
+            category_hits.append(category_hit)
+            scores += 3 * category_hit
+            
+            # Each distinct tag is tested once; the course counts are applied after the loop
+            tag_weights += features['tag_vocab'].str.contains(interest_lc, regex=False).to_numpy(dtype=np.int32)
+            
+            # Interest is in course title or description
+            scores += (
+                features['title_lc'].str.contains(interest_lc, regex=False) |
+                features['description_lc'].str.contains(interest_lc, regex=False)
+            ).to_numpy()
         
-        for interest in user_interests:
-            # Check if interest matches course category
-            if interest.lower() in course['category'].lower():
-                score += 3
-            
-            # Check if interest matches course tags
-            for tag in course_tags:
-                if interest.lower() in tag.lower():
-                    score += 2
-            
-            # Check if interest is in course title or description
-            if (interest.lower() in course['title'].lower() or 
-                interest.lower() in course['description'].lower()):
-                score += 1
+        # Each matching tag counts separately, per interest it matches; skipped when no tag matched
+        if tag_weights.any():
+            scores += 2 * (features['tag_counts'] @ tag_weights)
         
         # Score based on difficulty preference
         user_difficulty = preferences.get('difficulty_preference', 'Beginner')
-        if course['difficulty'] == user_difficulty:
-            score += 2
-        elif user_difficulty == 'Mixed':
-            score += 1
+        difficulty_match = features['difficulty'] == user_difficulty
+        if user_difficulty == 'Mixed':
+            scores += np.where(difficulty_match, 2, 1)
+        elif difficulty_match.any():
+            scores += 2 * difficulty_match
         
         # Score based on learning style (simplified mapping)
         learning_style = preferences.get('learning_style', 'Visual')
-        if learning_style == 'Visual' and 'visualization' in course.get('tags', []):
-            score += 1
-        elif learning_style == 'Kinesthetic' and 'hands-on' in course.get('tags', []):
-            score += 1
+        if learning_style == 'Visual':
+            scores += features['has_visualization']
+        elif learning_style == 'Kinesthetic':
+            scores += features['has_hands_on']
         
         # Adjust score based on estimated time vs user preference
-        user_time_pref = preferences.get('study_time', '30-60 minutes')
-        course_hours = course.get('estimated_hours', 0)
-        
-        if user_time_pref == '15-30 minutes' and course_hours <= 15:
-            score += 1
-        elif user_time_pref == '30-60 minutes' and 15 < course_hours <= 30:
-            score += 1
-        elif user_time_pref == '1-2 hours' and 30 < course_hours <= 50:
-            score += 1
-        elif user_time_pref == '2+ hours' and course_hours > 50:
-            score += 1
+        hours_range = STUDY_TIME_HOURS.get(preferences.get('study_time', '30-60 minutes'))
+        if hours_range is not None:
+            course_hours = features['estimated_hours']
+            scores += (course_hours > hours_range[0]) & (course_hours <= hours_range[1])
         
         # Boost popular courses slightly
         # This would typically use actual enrollment data
-        if course.get('rating', 0) >= 4.5:
-            score += 0.5
+        highly_rated = rating >= 4.5
+        scores += 0.5 * highly_rated
         
         # Consider user's past interactions
         category_interactions = interactions.get('categories', {})
-        if course['category'] in category_interactions:
-            score += category_interactions[course['category']] * 0.1
-        
-        return score
-    
-    def _generate_recommendation_reason(self, course: Dict[str, Any], preferences: Dict[str, Any], score: float) -> str:
-        """Generate a human-readable reason for the recommendation"""
-        reasons = []
+        if category_interactions:
+            scores += 0.1 * pd.Series(features['category']).map(category_interactions).fillna(0).to_numpy(dtype=float)
         
-        user_interests = preferences.get('interests', [])
+        # Primary reason per course, assigned from lowest to highest priority
+        reasons = np.full(num_courses, "Based on your learning preferences", dtype=object)
+        reasons[highly_rated] = "Highly rated (" + features['rating_text'][highly_rated] + "/5 stars)"
+        reasons[difficulty_match] = f"Perfect for your {str(user_difficulty).lower()} level"
+        for interest, category_hit in reversed(list(zip(interests, category_hits))):
+            reasons[category_hit] = f"Matches your interest in {interest}"
         
-        # Check interest matches
-        for interest in user_interests:
-            if interest.lower() in course['category'].lower():
-                reasons.append(f"Matches your interest in {interest}")
-                break
+        return scores, reasons
+    
+    def _migrate_timestamps(self, user_interactions: Dict[str, Any]):
+        """Convert ISO timestamps saved by older versions to epoch seconds in place"""
+        for key in ('course_views', 'enrollments', 'completions'):
+            for interaction in user_interactions.get(key, []):
+                interaction['timestamp'] = _epoch_seconds(interaction['timestamp'])
+        if 'last_updated' in user_interactions:
+            user_interactions['last_updated'] = _epoch_seconds(user_interactions['last_updated'])
+    
+    def _apply_interaction(self, user_id: str, interaction_type: str, course_id: str, timestamp: int, metadata: Dict[str, Any]):
+        """Fold a single interaction into the in-memory interaction history"""
+        if user_id not in self.user_interactions:
+            self.user_interactions[user_id] = {
+                'course_views': [],
+                'enrollments': [],
+                'completions': [],
+                'categories': {},
+                'last_updated': timestamp
+            }
         
-        # Check difficulty match
-        if course['difficulty'] == preferences.get('difficulty_preference', 'Beginner'):
-            reasons.append(f"Perfect for your {course['difficulty'].lower()} level")
+        interaction_data = {
+            'course_id': course_id,
+            'timestamp': timestamp,
+            'metadata': metadata
+        }
         
-        # Check rating
-        if course.get('rating', 0) >= 4.5:
-            reasons.append(f"Highly rated ({course['rating']}/5 stars)")
+        # Record the interaction
+        if interaction_type == 'view':
+            self.user_interactions[user_id]['course_views'].append(interaction_data)
+        elif interaction_type == 'enroll':
+            self.user_interactions[user_id]['enrollments'].append(interaction_data)
+        elif interaction_type == 'complete':
+            self.user_interactions[user_id]['completions'].append(interaction_data)
+            bisect.insort(self._completion_ts.setdefault(user_id, []), timestamp)
         
-        # Default reason
-        if not reasons:
-            reasons.append("Based on your learning preferences")
+        # Update category preferences
+        if 'category' in metadata:
+            category = metadata['category']
+            categories = self.user_interactions[user_id]['categories']
+            categories[category] = categories.get(category, 0) + 1
         
-        return reasons[0]  # Return the primary reason
+        self.user_interactions[user_id]['last_updated'] = timestamp
     
     def record_user_interaction(self, user_id: str, interaction_type: str, course_id: str, metadata: Dict[str, Any] = None):
         """Record user interaction for learning personalization"""
         try:
-            if user_id not in self.user_interactions:
-                self.user_interactions[user_id] = {
-                    'course_views': [],
-                    'enrollments': [],
-                    'completions': [],
-                    'categories': {},
-                    'last_updated': datetime.now().isoformat()
-                }
-            
-            interaction_data = {
+            timestamp = int(time.time())
+            metadata = metadata or {}
+            self._apply_interaction(user_id, interaction_type, course_id, timestamp, metadata)
+            self.invalidate_recommendations(user_id)
+            
+            # Append one record instead of rewriting the whole history
+            record = {
+                'user_id': user_id,
+                'type': interaction_type,
                 'course_id': course_id,
-                'timestamp': datetime.now().isoformat(),
-                'metadata': metadata or {}
+                'ts': timestamp,
+                'metadata': metadata
             }
+            with open(self.interactions_log_file, 'ab') as f:
+                f.write(orjson.dumps(record) + b'\n')
             
-            # Record the interaction
-            if interaction_type == 'view':
-                self.user_interactions[user_id]['course_views'].append(interaction_data)
-            elif interaction_type == 'enroll':
-                self.user_interactions[user_id]['enrollments'].append(interaction_data)
-            elif interaction_type == 'complete':
-                self.user_interactions[user_id]['completions'].append(interaction_data)
-            
-            # Update category preferences
-            if metadata and 'category' in metadata:
-                category = metadata['category']
-                categories = self.user_interactions[user_id]['categories']
-                categories[category] = categories.get(category, 0) + 1
-            
-            self.user_interactions[user_id]['last_updated'] = datetime.now().isoformat()
-            self._save_interactions()
+            self._logged_interactions += 1
+            if self._logged_interactions >= INTERACTIONS_COMPACT_EVERY:
+                self._compact_interactions()
             
         except Exception as e:
             st.error(f"Error recording interaction: {str(e)}")
@@ -230,8 +387,7 @@ class AIEngine:
     def get_learning_path(self, user_id: str, target_skill: str) -> List[Dict[str, Any]]:
         """Generate a suggested learning path for a specific skill"""
         try:
-            from utils.course_manager import CourseManager
-            course_manager = CourseManager()
+            course_manager = self._get_course_manager()
             
             # Get courses related to the target skill
             related_courses = course_manager.search_courses(query=target_skill)
@@ -286,8 +442,6 @@ class AIEngine:
     def get_adaptive_content_suggestions(self, user_id: str, current_course_id: str) -> Dict[str, Any]:
         """Suggest adaptive content based on user performance"""
         try:
-            user_interactions = self.user_interactions.get(user_id, {})
-            
             # Analyze user's learning patterns
             suggestions = {
                 'review_topics': [],
@@ -296,15 +450,15 @@ class AIEngine:
                 'study_schedule': {}
             }
             
-            # Simple heuristics for content adaptation
-            completions = user_interactions.get('completions', [])
-            recent_completions = [c for c in completions 
-                                if (datetime.now() - datetime.fromisoformat(c['timestamp'])).days <= 7]
+            # Simple heuristics for content adaptation; completions within the last 7 whole days
+            completion_ts = self._completion_ts.get(user_id, [])
+            cutoff = int(time.time()) - 8 * 86400 + 1
+            recent_count = len(completion_ts) - bisect.bisect_left(completion_ts, cutoff)
             
-            if len(recent_completions) < 2:
+            if recent_count < 2:
                 suggestions['difficulty_adjustment'] = 'reduce'
                 suggestions['study_schedule']['recommended_pace'] = 'slower'
-            elif len(recent_completions) > 5:
+            elif recent_count > 5:
                 suggestions['difficulty_adjustment'] = 'increase'
                 suggestions['study_schedule']['recommended_pace'] = 'faster'
             
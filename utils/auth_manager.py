@@ -1,20 +1,37 @@
 import hashlib
-import json
+import hmac
+import os
 import uuid
+import orjson
 from datetime import datetime
 from typing import Optional, Dict, Any
 import streamlit as st
 from .database import DatabaseManager
 
+PBKDF2_ITERATIONS = 100_000
+
 class AuthManager:
     """Handles user authentication and account management"""
     
     def __init__(self):
         self.db = DatabaseManager()
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _hash_password(self, password: str, salt: Optional[bytes] = None) -> str:
+        """Hash password using salted PBKDF2-HMAC-SHA256"""
+        if salt is None:
+            salt = os.urandom(16)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+    
+    def _verify_password(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash"""
+        if password_hash.startswith('pbkdf2_sha256$'):
+            _, iterations, salt, expected = password_hash.split('$')
+            digest = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+            return hmac.compare_digest(digest.hex(), expected)
+        
+        # Accounts created before PBKDF2 store a bare SHA-256 digest
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), password_hash)
     
     def create_user(self, username: str, email: str, password: str, preferences: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a new user account"""
@@ -24,7 +41,7 @@ class AuthManager:
             if existing_user:
                 return None
             
-            user_id = str(uuid.uuid4())
+            user_id = uuid.uuid4().hex
             hashed_password = self._hash_password(password)
             
             user_data = {
@@ -32,7 +49,7 @@ class AuthManager:
                 'username': username,
                 'email': email,
                 'password_hash': hashed_password,
-                'preferences': json.dumps(preferences)
+                'preferences': orjson.dumps(preferences).decode()
             }
             
             if self.db.create_user(user_data):
@@ -69,9 +86,7 @@ class AuthManager:
             if not user_data:
                 return None
             
-            hashed_password = self._hash_password(password)
-            
-            if user_data['password_hash'] == hashed_password and user_data['is_active']:
+            if self._verify_password(password, user_data['password_hash']) and user_data['is_active']:
                 # Update last login
                 self.db.update_user_login(username)
                 
@@ -79,7 +94,7 @@ class AuthManager:
                 preferences = {}
                 if user_data.get('preferences'):
                     try:
-                        preferences = json.loads(user_data['preferences'])
+                        preferences = orjson.loads(user_data['preferences'])
                     except:
                         preferences = {}
                 
@@ -114,7 +129,7 @@ class AuthManager:
                 return False
             
             # Verify current password
-            if self._hash_password(current_password) != user_data['password_hash']:
+            if not self._verify_password(current_password, user_data['password_hash']):
                 return False
             
             # Update email
@@ -143,7 +158,7 @@ class AuthManager:
                 preferences = {}
                 if user_data.get('preferences'):
                     try:
-                        preferences = json.loads(user_data['preferences'])
+                        preferences = orjson.loads(user_data['preferences'])
                     except:
                         preferences = {}
                 
@@ -1,13 +1,140 @@
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 import streamlit as st
+from collections import OrderedDict
 from typing import Optional, Any
+from .data_processor import _FRAME_FINGERPRINT, column_kinds, float32_corr
+
+# Serialize figures with orjson and resolve the shared template once instead of per figure
+pio.json.config.default_engine = 'orjson'
+pio.templates.default = 'plotly_white'
+
+# Line and scatter traces above this many points are downsampled before plotting
+LTTB_THRESHOLD = 5000
+LTTB_TARGET_POINTS = 2000
+
+# Correlation heatmaps wider than this show values on hover only
+HEATMAP_TEXT_MAX_COLUMNS = 15
+
+# Scatter and line traces above this many points render with WebGL instead of SVG
+WEBGL_THRESHOLD = 1000
+
+# Mobile-friendly, responsive layout applied to every chart in one update
+CHART_LAYOUT = dict(
+    autosize=True,
+    margin=dict(l=20, r=20, t=40, b=20),
+    font=dict(size=12),
+    showlegend=True,
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="right",
+        x=1
+    ),
+    xaxis=dict(automargin=True),
+    yaxis=dict(automargin=True)
+)
+
+# Number of built figures kept across reruns, keyed by their data and chart settings
+CHART_CACHE_SIZE = 16
+
+# Number of heatmap correlation matrices kept, keyed by a fingerprint of their input
+CORR_CACHE_SIZE = 32
+_corr_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+def _heatmap_correlation(numeric_data: pd.DataFrame) -> pd.DataFrame:
+    """Rounded float32 correlation matrix, reused while the numeric data is unchanged"""
+    key = (
+        tuple(numeric_data.columns),
+        numeric_data.shape,
+        int(pd.util.hash_pandas_object(numeric_data, index=False).sum())
+    )
+    corr_matrix = _corr_cache.get(key)
+    if corr_matrix is None:
+        # Rounded float32 values keep the serialized figure small
+        corr_matrix = float32_corr(numeric_data).round(3).astype(np.float32)
+        _corr_cache[key] = corr_matrix
+        if len(_corr_cache) > CORR_CACHE_SIZE:
+            _corr_cache.popitem(last=False)
+    else:
+        _corr_cache.move_to_end(key)
+    return corr_matrix
+
+def _value_counts(series: pd.Series) -> tuple:
+    """Distinct non-null values and their counts, most frequent first"""
+    codes, names = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(names))
+    order = np.argsort(-counts, kind='stable')
+    return np.asarray(names)[order], counts[order]
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling of x-sorted points"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected]) -
+            (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+    
+    return indices
+
+def _downsample_for_plot(data: pd.DataFrame, x_axis: str, y_axis: str,
+                         color_column: Optional[str]) -> pd.DataFrame:
+    """Reduce large numeric/datetime traces with LTTB, keeping each color group's shape"""
+    if len(data) <= LTTB_THRESHOLD or not y_axis:
+        return data
+    
+    x_is_time = pd.api.types.is_datetime64_any_dtype(data[x_axis])
+    if not (x_is_time or pd.api.types.is_numeric_dtype(data[x_axis])) or not pd.api.types.is_numeric_dtype(data[y_axis]):
+        return data
+    
+    plot_data = data.dropna(subset=[x_axis, y_axis]).sort_values(x_axis)
+    groups = plot_data.groupby(color_column, sort=False, observed=True) if color_column else [(None, plot_data)]
+    
+    sampled = []
+    for _, group in groups:
+        n_out = max(3, round(LTTB_TARGET_POINTS * len(group) / len(plot_data)))
+        x = group[x_axis].to_numpy(dtype=np.int64 if x_is_time else np.float64).astype(np.float64)
+        y = group[y_axis].to_numpy(dtype=np.float64)
+        sampled.append(group.iloc[_lttb_indices(x, y, n_out)])
+    
+    return pd.concat(sampled)
+
+def _float32_columns(data: pd.DataFrame, *columns: Optional[str]) -> pd.DataFrame:
+    """Cast the plotted float64 columns to float32, halving the serialized trace arrays"""
+    float_columns = [c for c in dict.fromkeys(columns) if c and data[c].dtype == np.float64]
+    if not float_columns:
+        return data
+    return data.assign(**{c: data[c].to_numpy(dtype=np.float32) for c in float_columns})
 
 class ChartGenerator:
     """Handles creation of various chart types using Plotly"""
     
+    # Stateless; every cache lives at module level
+    __slots__ = ()
+    
     def create_chart(self, data: pd.DataFrame, chart_type: str, x_axis: Optional[str], 
                     y_axis: Optional[str], color_column: Optional[str], 
                     title: str, height: int = 500) -> Optional[go.Figure]:
@@ -18,57 +145,11 @@ class ChartGenerator:
                 st.warning("No data available to create chart.")
                 return None
             
-            # Configure common chart properties
-            chart_config = {
-                'title': title,
-                'height': height,
-                'template': 'plotly_white'
-            }
-            
-            fig = None
-            
-            if chart_type == "Scatter Plot":
-                fig = self._create_scatter_plot(data, x_axis, y_axis, color_column, chart_config)
-            
-            elif chart_type == "Line Chart":
-                fig = self._create_line_chart(data, x_axis, y_axis, color_column, chart_config)
-            
-            elif chart_type == "Bar Chart":
-                fig = self._create_bar_chart(data, x_axis, y_axis, color_column, chart_config)
-            
-            elif chart_type == "Histogram":
-                fig = self._create_histogram(data, x_axis, color_column, chart_config)
-            
-            elif chart_type == "Box Plot":
-                fig = self._create_box_plot(data, x_axis, y_axis, color_column, chart_config)
-            
-            elif chart_type == "Heatmap":
-                fig = self._create_heatmap(data, chart_config)
-            
-            elif chart_type == "Pie Chart":
-                fig = self._create_pie_chart(data, x_axis, y_axis, chart_config)
+            fig = self._build_chart(data, chart_type, x_axis, y_axis, color_column, title, height)
             
             if fig:
-                # Apply mobile-friendly configurations
-                fig.update_layout(
-                    autosize=True,
-                    margin=dict(l=20, r=20, t=40, b=20),
-                    font=dict(size=12),
-                    showlegend=True,
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    )
-                )
-                
-                # Make it responsive
-                fig.update_layout(
-                    xaxis=dict(automargin=True),
-                    yaxis=dict(automargin=True)
-                )
+                # Keep the rendered figure so exports reuse it instead of rebuilding
+                st.session_state.current_fig = fig
             
             return fig
             
@@ -76,36 +157,98 @@ class ChartGenerator:
             st.error(f"Error creating {chart_type}: {str(e)}")
             return None
     
+    @st.cache_data(show_spinner=False, max_entries=CHART_CACHE_SIZE, hash_funcs=_FRAME_FINGERPRINT)
+    def _build_chart(_self, data: pd.DataFrame, chart_type: str, x_axis: Optional[str], 
+                     y_axis: Optional[str], color_column: Optional[str], 
+                     title: str, height: int) -> Optional[go.Figure]:
+        """Build and lay out a figure, reused across reruns for the same data and settings"""
+        # Configure common chart properties
+        chart_config = {
+            'title': title,
+            'height': height,
+            'template': 'plotly_white'
+        }
+        
+        fig = None
+        
+        if chart_type == "Scatter Plot":
+            fig = _self._create_scatter_plot(data, x_axis, y_axis, color_column, chart_config)
+        
+        elif chart_type == "Line Chart":
+            fig = _self._create_line_chart(data, x_axis, y_axis, color_column, chart_config)
+        
+        elif chart_type == "Bar Chart":
+            fig = _self._create_bar_chart(data, x_axis, y_axis, color_column, chart_config)
+        
+        elif chart_type == "Histogram":
+            fig = _self._create_histogram(data, x_axis, color_column, chart_config)
+        
+        elif chart_type == "Box Plot":
+            fig = _self._create_box_plot(data, x_axis, y_axis, color_column, chart_config)
+        
+        elif chart_type == "Heatmap":
+            fig = _self._create_heatmap(data, chart_config)
+        
+        elif chart_type == "Pie Chart":
+            fig = _self._create_pie_chart(data, x_axis, y_axis, chart_config)
+        
+        if fig:
+            fig.update_layout(CHART_LAYOUT)
+        
+        return fig
+    
     def _create_scatter_plot(self, data: pd.DataFrame, x_axis: str, y_axis: str, 
                            color_column: Optional[str], config: dict) -> go.Figure:
         """Create a scatter plot"""
+        plot_data = _float32_columns(_downsample_for_plot(data, x_axis, y_axis, color_column), x_axis, y_axis)
+        use_webgl = len(plot_data) > WEBGL_THRESHOLD
+        
         fig = px.scatter(
-            data, 
+            plot_data, 
             x=x_axis, 
             y=y_axis, 
             color=color_column,
             title=config['title'],
             height=config['height'],
-            template=config['template']
+            template=config['template'],
+            render_mode='webgl' if use_webgl else 'auto'
         )
         
         # Add trend line for numeric data
-        if data[x_axis].dtype in ['int64', 'float64'] and data[y_axis].dtype in ['int64', 'float64']:
-            fig.add_trace(
-                go.Scatter(
-                    x=data[x_axis], 
-                    y=np.poly1d(np.polyfit(data[x_axis], data[y_axis], 1))(data[x_axis]),
-                    mode='lines',
-                    name='Trend Line',
-                    line=dict(dash='dash', color='red')
+        if all(pd.api.types.is_numeric_dtype(data[c]) and not pd.api.types.is_bool_dtype(data[c]) for c in (x_axis, y_axis)):
+            # Closed-form least squares fit on float32 copies of the rows where both values are present
+            x = data[x_axis].to_numpy(dtype=np.float32, na_value=np.nan)
+            y = data[y_axis].to_numpy(dtype=np.float32, na_value=np.nan)
+            finite = np.isfinite(x) & np.isfinite(y)
+            x, y = x[finite], y[finite]
+            
+            if x.size >= 2:
+                x_mean, y_mean = x.mean(), y.mean()
+                x_centered = x - x_mean
+                x_var = np.dot(x_centered, x_centered)
+                slope = np.dot(x_centered, y - y_mean) / x_var if x_var else np.float32(0)
+                intercept = y_mean - slope * x_mean
+                
+                # A straight line only needs its two endpoints
+                x_ends = np.array([x.min(), x.max()], dtype=np.float32)
+                fig.add_trace(
+                    go.Scatter(
+                        x=x_ends, 
+                        y=slope * x_ends + intercept,
+                        mode='lines',
+                        name='Trend Line',
+                        line=dict(dash='dash', color='red')
+                    )
                 )
-            )
         
         return fig
     
     def _create_line_chart(self, data: pd.DataFrame, x_axis: str, y_axis: str, 
                           color_column: Optional[str], config: dict) -> go.Figure:
         """Create a line chart"""
+        data = _float32_columns(_downsample_for_plot(data, x_axis, y_axis, color_column), x_axis, y_axis)
+        render_mode = 'webgl' if len(data) > WEBGL_THRESHOLD else 'auto'
+        
         if color_column:
             fig = px.line(
                 data, 
@@ -114,7 +257,8 @@ class ChartGenerator:
                 color=color_column,
                 title=config['title'],
                 height=config['height'],
-                template=config['template']
+                template=config['template'],
+                render_mode=render_mode
             )
         else:
             fig = px.line(
@@ -123,7 +267,8 @@ class ChartGenerator:
                 y=y_axis,
                 title=config['title'],
                 height=config['height'],
-                template=config['template']
+                template=config['template'],
+                render_mode=render_mode
             )
         
         return fig
@@ -133,10 +278,10 @@ class ChartGenerator:
         """Create a bar chart"""
         # Aggregate data if needed
         if y_axis:
-            agg_data = data.groupby(x_axis)[y_axis].sum().reset_index()
+            agg_data = data.groupby(x_axis, sort=False, observed=True)[y_axis].sum().reset_index()
         else:
-            agg_data = data[x_axis].value_counts().reset_index()
-            agg_data.columns = [x_axis, 'count']
+            names, counts = _value_counts(data[x_axis])
+            agg_data = pd.DataFrame({x_axis: names, 'count': counts})
             y_axis = 'count'
         
         fig = px.bar(
@@ -164,20 +309,42 @@ class ChartGenerator:
             nbins=30
         )
         
-        # Add statistics
-        mean_val = data[x_axis].mean()
-        median_val = data[x_axis].median()
+        column = data[x_axis]
+        if pd.api.types.is_numeric_dtype(column):
+            # Numeric statistics; the median comes from a linear-time partition instead of a full sort
+            values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                return fig
+            
+            mean_val = values.mean()
+            middle = values.size // 2
+            if values.size % 2:
+                median_val = np.partition(values, middle)[middle]
+            else:
+                lower, upper = np.partition(values, [middle - 1, middle])[middle - 1:middle + 1]
+                median_val = (lower + upper) / 2
+            mean_label, median_label = f"{mean_val:.2f}", f"{median_val:.2f}"
+        elif pd.api.types.is_datetime64_any_dtype(column):
+            # Datetimes keep their own type so the markers land on the right axis values
+            mean_val, median_val = column.mean(), column.median()
+            if pd.isna(mean_val):
+                return fig
+            mean_label, median_label = str(mean_val), str(median_val)
+        else:
+            return fig
         
         fig.add_vline(x=mean_val, line_dash="dash", line_color="red", 
-                     annotation_text=f"Mean: {mean_val:.2f}")
+                     annotation_text=f"Mean: {mean_label}")
         fig.add_vline(x=median_val, line_dash="dash", line_color="blue", 
-                     annotation_text=f"Median: {median_val:.2f}")
+                     annotation_text=f"Median: {median_label}")
         
         return fig
     
     def _create_box_plot(self, data: pd.DataFrame, x_axis: Optional[str], y_axis: str, 
                         color_column: Optional[str], config: dict) -> go.Figure:
         """Create a box plot"""
+        data = _float32_columns(data, x_axis, y_axis)
         if x_axis:
             fig = px.box(
                 data, 
@@ -201,16 +368,17 @@ class ChartGenerator:
     
     def _create_heatmap(self, data: pd.DataFrame, config: dict) -> go.Figure:
         """Create a correlation heatmap"""
-        numeric_data = data.select_dtypes(include=[np.number])
+        numeric_data = data[column_kinds(data)['numeric']]
         
         if numeric_data.shape[1] < 2:
             raise ValueError("Need at least 2 numeric columns for heatmap")
         
-        corr_matrix = numeric_data.corr()
+        corr_matrix = _heatmap_correlation(numeric_data)
+        show_cell_text = corr_matrix.shape[1] <= HEATMAP_TEXT_MAX_COLUMNS
         
         fig = px.imshow(
             corr_matrix,
-            text_auto=True,
+            text_auto='.2f' if show_cell_text else False,
             aspect="auto",
             title=config['title'],
             height=config['height'],
@@ -218,6 +386,9 @@ class ChartGenerator:
             color_continuous_scale="RdBu_r"
         )
         
+        if not show_cell_text:
+            fig.update_traces(hovertemplate='%{x} / %{y}: %{z:.2f}<extra></extra>')
+        
         return fig
     
     def _create_pie_chart(self, data: pd.DataFrame, x_axis: str, y_axis: Optional[str], 
@@ -225,7 +396,7 @@ class ChartGenerator:
         """Create a pie chart"""
         if y_axis:
             # Use specified value column
-            agg_data = data.groupby(x_axis)[y_axis].sum().reset_index()
+            agg_data = data.groupby(x_axis, sort=False, observed=True)[y_axis].sum().reset_index()
             fig = px.pie(
                 agg_data, 
                 names=x_axis, 
@@ -236,10 +407,10 @@ class ChartGenerator:
             )
         else:
             # Use count of categories
-            value_counts = data[x_axis].value_counts()
+            names, counts = _value_counts(data[x_axis])
             fig = px.pie(
-                values=value_counts.values, 
-                names=value_counts.index,
+                values=counts, 
+                names=names,
                 title=config['title'],
                 height=config['height'],
                 template=config['template']
@@ -251,8 +422,9 @@ class ChartGenerator:
         """Suggest appropriate chart types based on data characteristics"""
         recommendations = []
         
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
-        categorical_cols = data.select_dtypes(include=['object', 'string']).columns
+        kinds = column_kinds(data)
+        numeric_cols = kinds['numeric']
+        categorical_cols = kinds['categorical']
         
         # Based on data types, suggest appropriate charts
         if len(numeric_cols) >= 2:
@@ -267,4 +439,4 @@ class ChartGenerator:
         if len(numeric_cols) >= 1 and len(categorical_cols) >= 1:
             recommendations.extend(["Box Plot", "Bar Chart"])
         
-        return list(set(recommendations))  # Remove duplicates
+        return list(dict.fromkeys(recommendations))  # Remove duplicates, keeping suggestion order
@@ -1,212 +1,175 @@
-import json
-import uuid
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
 import streamlit as st
 from .database import DatabaseManager
 
+def _parse_lessons(raw: Any) -> List[Dict[str, Any]]:
+    """Lessons as a list, whether the driver returned decoded JSONB or a JSON string"""
+    if not raw:
+        return []
+    if not isinstance(raw, (str, bytes)):
+        return raw
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return []
+
 class CourseManager:
     """Handles course creation, management, and enrollment"""
     
     def __init__(self):
         self.db = DatabaseManager()
-        self._initialize_sample_courses()
+        self._load_catalog()
+        self._enrollments: Dict[str, Set[str]] = {}
+    
+    def _load_catalog(self):
+        """Read the catalog and rebuild everything derived from it"""
+        self._catalog_version = self.db.courses_version
+        self._all_courses = tuple(self._load_courses())
+        self._courses_by_id = {course['course_id']: course for course in self._all_courses}
+        self._catalog = pd.DataFrame(list(self._all_courses))
+        self._search_blob = self._build_search_blob(self._catalog)
+        self._build_indexes()
+        self._categories = tuple(self._by_category)
+        self._scoring_features = None
+    
+    def _refresh_catalog(self):
+        """Reload the catalog if courses were written since it was read"""
+        if self._catalog_version != self.db.courses_version:
+            self._load_catalog()
+    
+    @property
+    def catalog_version(self) -> int:
+        """Version of the current catalog, for keying caches of catalog reads"""
+        self._refresh_catalog()
+        return self._catalog_version
     
-    def _initialize_sample_courses(self):
-        """Initialize with sample courses if none exist"""
-        existing_courses = self.db.get_all_courses()
-        if existing_courses:
+    def _build_indexes(self):
+        """Map each category and difficulty to the catalog rows that have it"""
+        if self._catalog.empty:
+            self._by_category, self._by_difficulty = {}, {}
             return
-        
-        # No sample courses needed since we initialized via script
-            sample_courses = [
-                {
-                    'course_id': str(uuid.uuid4()),
-                    'title': 'Python Programming Fundamentals',
-                    'description': 'Learn the basics of Python programming including variables, functions, loops, and data structures. Perfect for beginners starting their coding journey.',
-                    'category': 'Technology',
-                    'difficulty': 'Beginner',
-                    'estimated_hours': 20,
-                    'rating': 4.5,
-                    'instructor': 'Dr. Sarah Johnson',
-                    'tags': ['python', 'programming', 'coding', 'fundamentals'],
-                    'prerequisites': [],
-                    'learning_outcomes': [
-                        'Understand Python syntax and basic programming concepts',
-                        'Write simple Python programs',
-                        'Work with data types and variables',
-                        'Create functions and use loops'
-                    ],
-                    'created_at': datetime.now().isoformat()
-                },
-                {
-                    'course_id': str(uuid.uuid4()),
-                    'title': 'Data Science with Python',
-                    'description': 'Comprehensive course covering data analysis, visualization, and machine learning using Python libraries like pandas, numpy, and scikit-learn.',
-                    'category': 'Technology',
-                    'difficulty': 'Intermediate',
-                    'estimated_hours': 40,
-                    'rating': 4.7,
-                    'instructor': 'Prof. Michael Chen',
-                    'tags': ['data science', 'python', 'machine learning', 'analytics'],
-                    'prerequisites': ['Basic Python knowledge'],
-                    'learning_outcomes': [
-                        'Analyze and visualize data using pandas and matplotlib',
-                        'Build machine learning models',
-                        'Understand statistical concepts',
-                        'Work with real-world datasets'
-                    ],
-                    'created_at': datetime.now().isoformat()
-                },
-                {
-                    'course_id': str(uuid.uuid4()),
-                    'title': 'Introduction to Machine Learning',
-                    'description': 'Explore the fundamentals of machine learning including supervised and unsupervised learning, neural networks, and practical applications.',
-                    'category': 'Technology',
-                    'difficulty': 'Intermediate',
-                    'estimated_hours': 35,
-                    'rating': 4.6,
-                    'instructor': 'Dr. Emily Rodriguez',
-                    'tags': ['machine learning', 'AI', 'algorithms', 'neural networks'],
-                    'prerequisites': ['Mathematics basics', 'Programming experience'],
-                    'learning_outcomes': [
-                        'Understand core ML algorithms',
-                        'Implement classification and regression models',
-                        'Evaluate model performance',
-                        'Apply ML to real problems'
-                    ],
-                    'created_at': datetime.now().isoformat()
-                },
-                {
-                    'course_id': str(uuid.uuid4()),
-                    'title': 'Digital Marketing Strategy',
-                    'description': 'Learn how to create effective digital marketing campaigns, understand SEO, social media marketing, and analytics.',
-                    'category': 'Business',
-                    'difficulty': 'Beginner',
-                    'estimated_hours': 25,
-                    'rating': 4.3,
-                    'instructor': 'Maria Lopez',
-                    'tags': ['marketing', 'digital', 'SEO', 'social media'],
-                    'prerequisites': [],
-                    'learning_outcomes': [
-                        'Develop digital marketing strategies',
-                        'Understand SEO principles',
-                        'Create social media campaigns',
-                        'Analyze marketing metrics'
-                    ],
-                    'created_at': datetime.now().isoformat()
-                },
-                {
-                    'course_id': str(uuid.uuid4()),
-                    'title': 'Calculus I: Limits and Derivatives',
-                    'description': 'Foundation course in calculus covering limits, continuity, derivatives, and their applications in real-world problems.',
-                    'category': 'Mathematics',
-                    'difficulty': 'Intermediate',
-                    'estimated_hours': 45,
-                    'rating': 4.4,
-                    'instructor': 'Dr. Robert Kim',
-                    'tags': ['calculus', 'mathematics', 'derivatives', 'limits'],
-                    'prerequisites': ['Algebra', 'Pre-calculus'],
-                    'learning_outcomes': [
-                        'Understand limits and continuity',
-                        'Calculate derivatives',
-                        'Apply derivatives to optimization',
-                        'Solve related rates problems'
-                    ],
-                    'created_at': datetime.now().isoformat()
-                }
-            ]
-            
-            for course in sample_courses:
-                self.courses[course['course_id']] = course
-                
-                # Add sample lessons for each course
-                self._create_sample_lessons(course['course_id'])
-            
-            self._save_courses()
+        self._by_category = self._catalog.groupby('category', sort=True).indices
+        self._by_difficulty = self._catalog.groupby('difficulty', sort=True).indices
     
-    def _create_sample_lessons(self, course_id: str):
-        """Create sample lessons for a course"""
-        course = self.courses[course_id]
-        
-        if 'Python Programming' in course['title']:
-            lessons = [
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Introduction to Python', 'duration_minutes': 30, 'content': 'Learn what Python is and why it\'s popular.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Variables and Data Types', 'duration_minutes': 45, 'content': 'Understanding different data types in Python.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Control Structures', 'duration_minutes': 60, 'content': 'If statements, loops, and control flow.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Functions', 'duration_minutes': 50, 'content': 'Creating and using functions in Python.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Data Structures', 'duration_minutes': 70, 'content': 'Lists, dictionaries, and sets.'}
-            ]
-        elif 'Data Science' in course['title']:
-            lessons = [
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Introduction to Data Science', 'duration_minutes': 40, 'content': 'Overview of data science field.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'NumPy Fundamentals', 'duration_minutes': 55, 'content': 'Working with numerical arrays.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Pandas for Data Analysis', 'duration_minutes': 75, 'content': 'Data manipulation and analysis.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Data Visualization', 'duration_minutes': 60, 'content': 'Creating charts and graphs.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Statistical Analysis', 'duration_minutes': 80, 'content': 'Statistical methods and hypothesis testing.'}
-            ]
-        elif 'Machine Learning' in course['title']:
-            lessons = [
-                {'lesson_id': str(uuid.uuid4()), 'title': 'What is Machine Learning?', 'duration_minutes': 35, 'content': 'Introduction to ML concepts.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Supervised Learning', 'duration_minutes': 65, 'content': 'Classification and regression algorithms.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Unsupervised Learning', 'duration_minutes': 55, 'content': 'Clustering and dimensionality reduction.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Model Evaluation', 'duration_minutes': 50, 'content': 'Metrics and validation techniques.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Neural Networks', 'duration_minutes': 70, 'content': 'Introduction to deep learning.'}
-            ]
-        elif 'Marketing' in course['title']:
-            lessons = [
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Digital Marketing Overview', 'duration_minutes': 30, 'content': 'Understanding digital marketing landscape.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'SEO Fundamentals', 'duration_minutes': 45, 'content': 'Search engine optimization basics.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Social Media Marketing', 'duration_minutes': 40, 'content': 'Leveraging social platforms.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Content Marketing', 'duration_minutes': 50, 'content': 'Creating engaging content.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Analytics and Metrics', 'duration_minutes': 35, 'content': 'Measuring marketing success.'}
-            ]
-        else:  # Calculus
-            lessons = [
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Introduction to Limits', 'duration_minutes': 50, 'content': 'Understanding the concept of limits.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Limit Laws and Theorems', 'duration_minutes': 60, 'content': 'Mathematical rules for limits.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Continuity', 'duration_minutes': 45, 'content': 'When functions are continuous.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Introduction to Derivatives', 'duration_minutes': 55, 'content': 'The derivative concept.'},
-                {'lesson_id': str(uuid.uuid4()), 'title': 'Derivative Rules', 'duration_minutes': 70, 'content': 'Power rule, product rule, chain rule.'}
-            ]
-        
-        course['lessons'] = lessons
+    def _build_search_blob(self, catalog: pd.DataFrame) -> pd.Series:
+        """Lowercased title, description and tags per course, separated so matches never span fields"""
+        if catalog.empty:
+            return pd.Series(dtype=object)
+        tags = catalog['tags'].map(lambda course_tags: ' '.join(course_tags or []))
+        return (catalog['title'].fillna('') + '\x1f' + catalog['description'].fillna('') + '\x1f' + tags).str.lower()
     
     def get_course(self, course_id: str) -> Optional[Dict[str, Any]]:
         """Get course by ID"""
+        self._refresh_catalog()
+        course = self._courses_by_id.get(course_id)
+        if course:
+            return dict(course)
+        
+        # Courses written by another process since the catalog was loaded
         course = self.db.get_course_by_id(course_id)
-        if course and course.get('lessons'):
-            try:
-                course['lessons'] = json.loads(course['lessons'])
-            except:
-                course['lessons'] = []
+        if course:
+            course['lessons'] = _parse_lessons(course.get('lessons'))
         return course
     
-    def get_all_courses(self) -> List[Dict[str, Any]]:
-        """Get all courses"""
+    def get_courses(self, course_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get multiple courses by ID, indexed by course ID"""
+        self._refresh_catalog()
+        found = {
+            course_id: dict(self._courses_by_id[course_id])
+            for course_id in course_ids if course_id in self._courses_by_id
+        }
+        
+        # Courses written by another process since the catalog was loaded
+        missing = [course_id for course_id in course_ids if course_id not in found]
+        if missing:
+            for course in self.db.get_courses_by_ids(missing):
+                course['lessons'] = _parse_lessons(course.get('lessons'))
+                found[course['course_id']] = course
+        return found
+    
+    def _load_courses(self) -> List[Dict[str, Any]]:
+        """Read every course from the database with its lessons parsed"""
         courses = self.db.get_all_courses()
         for course in courses:
-            if course.get('lessons'):
-                try:
-                    course['lessons'] = json.loads(course['lessons'])
-                except:
-                    course['lessons'] = []
+            course['lessons'] = _parse_lessons(course.get('lessons'))
         return courses
     
-    def get_categories(self) -> List[str]:
+    def get_all_courses(self) -> Tuple[Dict[str, Any], ...]:
+        """Get all courses"""
+        self._refresh_catalog()
+        return self._all_courses
+    
+    def get_categories(self) -> Tuple[str, ...]:
         """Get all course categories"""
-        return self.db.get_course_categories()
+        self._refresh_catalog()
+        return self._categories
     
     def search_courses(self, query: str = "", category: str = "All", difficulty: str = "All") -> List[Dict[str, Any]]:
         """Search courses with filters"""
-        courses = self.db.search_courses(query, category, difficulty)
-        for course in courses:
-            if course.get('lessons'):
-                try:
-                    course['lessons'] = json.loads(course['lessons'])
-                except:
-                    course['lessons'] = []
-        return courses
+        self._refresh_catalog()
+        catalog = self._catalog
+        if catalog.empty:
+            return []
+        
+        # Start from the rows the category and difficulty indexes allow
+        rows = None
+        no_rows = np.empty(0, dtype=np.intp)
+        if category and category != "All":
+            rows = self._by_category.get(category, no_rows)
+        if difficulty and difficulty != "All":
+            difficulty_rows = self._by_difficulty.get(difficulty, no_rows)
+            rows = difficulty_rows if rows is None else np.intersect1d(rows, difficulty_rows)
+        
+        results = catalog if rows is None else catalog.iloc[rows]
+        
+        # Only the remaining rows are scanned for the query text
+        if query:
+            search_blob = self._search_blob if rows is None else self._search_blob.iloc[rows]
+            results = results[search_blob.str.contains(query.lower(), regex=False).to_numpy()]
+        
+        return results.to_dict('records')
+    
+    def get_scoring_features(self) -> Optional[Dict[str, Any]]:
+        """Column arrays of the catalog used for vectorized recommendation scoring"""
+        self._refresh_catalog()
+        if self._scoring_features is None and not self._catalog.empty:
+            catalog = self._catalog
+            tags = catalog['tags'].map(lambda course_tags: list(course_tags or []))
+            
+            # Course x tag occurrence counts over the vocabulary of distinct lowercased tags
+            tag_owner = np.repeat(np.arange(len(catalog)), tags.map(len).to_numpy())
+            tag_codes, tag_vocab = pd.factorize(
+                pd.Series([tag for course_tags in tags for tag in course_tags], dtype=object).str.lower()
+            )
+            tag_counts = np.zeros((len(catalog), len(tag_vocab)), dtype=np.int32)
+            np.add.at(tag_counts, (tag_owner, tag_codes), 1)
+            
+            category_lc = catalog['category'].fillna('').str.lower()
+            category_codes, category_vocab = pd.factorize(category_lc)
+            
+            self._scoring_features = {
+                'courses': catalog.to_dict('records'),
+                'course_id': catalog['course_id'].to_numpy(),
+                'category': catalog['category'].to_numpy(),
+                'difficulty': catalog['difficulty'].to_numpy(),
+                'category_lc': category_lc,
+                'category_codes': category_codes,
+                'category_vocab': pd.Series(category_vocab, dtype=object),
+                'title_lc': catalog['title'].fillna('').str.lower(),
+                'description_lc': catalog['description'].fillna('').str.lower(),
+                'rating': pd.to_numeric(catalog['rating'], errors='coerce').astype(float).fillna(0).to_numpy(),
+                'rating_text': catalog['rating'].astype(str).to_numpy(dtype=object),
+                'estimated_hours': pd.to_numeric(catalog['estimated_hours'], errors='coerce').astype(float).fillna(0).to_numpy(),
+                'tag_vocab': pd.Series(tag_vocab, dtype=object),
+                'tag_counts': tag_counts,
+                'has_visualization': tags.map(lambda course_tags: 'visualization' in course_tags).to_numpy(dtype=bool),
+                'has_hands_on': tags.map(lambda course_tags: 'hands-on' in course_tags).to_numpy(dtype=bool)
+            }
+        
+        return self._scoring_features
     
     def get_course_lessons(self, course_id: str) -> List[Dict[str, Any]]:
         """Get lessons for a specific course"""
@@ -215,29 +178,40 @@ class CourseManager:
             return course.get('lessons', [])
         return []
     
+    def get_lessons_for_courses(self, course_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get lessons for multiple courses, indexed by course ID"""
+        courses = self.get_courses(course_ids)
+        return {course_id: course.get('lessons') or [] for course_id, course in courses.items()}
+    
     def enroll_user(self, user_id: str, course_id: str) -> bool:
         """Enroll a user in a course"""
-        return self.db.enroll_user(user_id, course_id)
+        enrolled = self.db.enroll_user(user_id, course_id)
+        if enrolled and user_id in self._enrollments:
+            self._enrollments[user_id].add(course_id)
+        return enrolled
     
     def get_user_enrollments(self, user_id: str) -> List[str]:
         """Get all courses a user is enrolled in"""
-        return self.db.get_user_enrollments(user_id)
+        enrollments = self.db.get_user_enrollments(user_id)
+        self._enrollments[user_id] = set(enrollments)
+        return enrollments
     
     def is_user_enrolled(self, user_id: str, course_id: str) -> bool:
         """Check if user is enrolled in a course"""
-        enrollments = self.db.get_user_enrollments(user_id)
+        # Known users answer from memory; others get a single-row lookup instead of their full list
+        enrollments = self._enrollments.get(user_id)
+        if enrollments is None:
+            return self.db.is_enrolled(user_id, course_id)
         return course_id in enrollments
     
     def get_course_stats(self, course_id: str) -> Dict[str, Any]:
         """Get statistics for a course"""
-        enrollment_count = sum(1 for enrollments in self.enrollments.values() if course_id in enrollments)
-        
-        course = self.courses.get(course_id)
+        course = self.get_course(course_id)
         if not course:
             return {}
         
         return {
-            'enrollment_count': enrollment_count,
+            'enrollment_count': self.db.count_enrollments(course_id),
             'rating': course.get('rating', 0),
             'total_lessons': len(course.get('lessons', [])),
             'estimated_hours': course.get('estimated_hours', 0),
@@ -246,39 +220,50 @@ class CourseManager:
     
     def get_recommended_courses(self, user_interests: List[str], user_difficulty: str, exclude_enrolled: List[str] = None) -> List[Dict[str, Any]]:
         """Get courses recommended based on user preferences"""
-        if exclude_enrolled is None:
-            exclude_enrolled = []
+        features = self.get_scoring_features()
+        if features is None:
+            return []
         
-        recommendations = []
+        # Score every course at once from the catalog's column arrays
+        score = np.zeros(len(features['course_id']))
+        if user_interests:
+            # Match interests against the distinct tags and categories only, then map back to courses
+            interests_lc = [interest.lower() for interest in user_interests]
+            tag_matches = np.column_stack([
+                features['tag_vocab'].str.contains(interest_lc, regex=False).to_numpy(dtype=np.int32)
+                for interest_lc in interests_lc
+            ])
+            category_matches = np.column_stack([
+                features['category_vocab'].str.contains(interest_lc, regex=False).to_numpy(dtype=np.int32)
+                for interest_lc in interests_lc
+            ])
+            score += 2 * np.count_nonzero(features['tag_counts'] @ tag_matches, axis=1)
+            score += 3 * category_matches.sum(axis=1)[features['category_codes']]
         
-        for course in self.courses.values():
-            if course['course_id'] in exclude_enrolled:
-                continue
-            
-            score = 0
-            
-            # Score based on interests
-            course_tags = course.get('tags', [])
-            for interest in user_interests:
-                if any(interest.lower() in tag.lower() for tag in course_tags):
-                    score += 2
-                if interest.lower() in course['category'].lower():
-                    score += 3
-            
-            # Score based on difficulty preference
-            if course['difficulty'] == user_difficulty:
-                score += 1
-            elif user_difficulty == "Mixed":
-                score += 0.5
-            
-            # Add rating bonus
-            score += course.get('rating', 0) * 0.5
-            
-            if score > 0:
-                course_copy = course.copy()
-                course_copy['recommendation_score'] = score
-                recommendations.append(course_copy)
+        # Score based on difficulty preference
+        if user_difficulty == "Mixed":
+            score += np.where(features['difficulty'] == user_difficulty, 1, 0.5)
+        else:
+            score += features['difficulty'] == user_difficulty
+        
+        # Add rating bonus
+        score += features['rating'] * 0.5
+        
+        eligible = score > 0
+        if exclude_enrolled:
+            eligible &= ~np.isin(features['course_id'], exclude_enrolled)
         
-        # Sort by recommendation score
-        recommendations.sort(key=lambda x: x['recommendation_score'], reverse=True)
-        return recommendations[:10]  # Return top 10
\ No newline at end of file
+        # Partition out the tenth best score, then sort only the courses reaching it,
+        # keeping catalog order among ties
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) > 10:
+            tenth_best = np.partition(score[candidates], len(candidates) - 10)[len(candidates) - 10]
+            candidates = candidates[score[candidates] >= tenth_best]
+        top = candidates[np.argsort(-score[candidates], kind='stable')[:10]]
+        
+        recommendations = []
+        for position in top:
+            course_copy = dict(features['courses'][position])
+            course_copy['recommendation_score'] = float(score[position])
+            recommendations.append(course_copy)
+        return recommendations
@@ -1,7 +1,294 @@
+import io
+import warnings
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+# Text columns with fewer distinct values than this share of rows are loaded as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def _read_csv_arrow(file_bytes: bytes) -> pd.DataFrame:
+    """Parse CSV bytes with the multithreaded PyArrow reader"""
+    # A native buffer reader avoids routing Arrow's block reads through Python file calls
+    buffer = pa.py_buffer(file_bytes)
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=8 << 20)
+    table = pa_csv.read_csv(pa.BufferReader(buffer), read_options=read_options)
+    
+    # Arrow keeps undecodable text as binary columns; retry those files as latin-1
+    if any(pa.types.is_binary(field.type) for field in table.schema):
+        read_options = pa_csv.ReadOptions(use_threads=True, block_size=8 << 20, encoding='latin-1')
+        table = pa_csv.read_csv(pa.BufferReader(buffer), read_options=read_options)
+    
+    return table.to_pandas(self_destruct=True)
+
+def _downcast_integer_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store int64 columns in the narrowest integer type that holds their values"""
+    for column in df.columns:
+        if df[column].dtype == np.int64:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+    return df
+
+def _categorize_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store repetitive text columns as categoricals so equality and isin compare integer codes"""
+    for column in df.columns:
+        series = df[column]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        if series.nunique() < len(series) * CATEGORY_MAX_UNIQUE_RATIO:
+            df[column] = series.astype('category')
+    return df
+
+@st.cache_data(show_spinner=False)
+def _parse_file(file_bytes: bytes, file_name: str) -> pd.DataFrame:
+    """Parse uploaded file contents, cached on the raw bytes across reruns"""
+    if file_name.endswith('.csv'):
+        df = _read_csv_arrow(file_bytes)
+    
+    elif file_name.endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(io.BytesIO(file_bytes))
+    
+    else:
+        raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
+    
+    # Basic data validation
+    if df.empty:
+        raise ValueError("The uploaded file is empty.")
+    
+    # Clean column names
+    df.columns = df.columns.str.strip()
+    
+    return _categorize_text_columns(_downcast_integer_columns(df))
+
+def _arrow_in_mask(series: pd.Series, values) -> np.ndarray:
+    """Membership mask computed with Arrow's is_in kernel"""
+    # Categorical membership is already an integer code lookup
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    
+    column = pa.array(series, from_pandas=True)
+    try:
+        value_set = pa.array(list(values), from_pandas=True)
+        if value_set.type != column.type:
+            # Only numeric-to-numeric and text-to-text values are cast; a safe cast rejects
+            # values the column cannot hold, such as 1000 for an int8 column
+            if not (_arrow_same_kind(value_set.type, column.type) or pa.types.is_null(value_set.type)):
+                return series.isin(values).to_numpy()
+            value_set = value_set.cast(column.type)
+        return pc.is_in(column, value_set=value_set).to_numpy(zero_copy_only=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return series.isin(values).to_numpy()
+
+def _arrow_same_kind(left: pa.DataType, right: pa.DataType) -> bool:
+    """Whether two Arrow types are both numeric or both text"""
+    def numeric(t):
+        return pa.types.is_integer(t) or pa.types.is_floating(t)
+    def text(t):
+        return pa.types.is_string(t) or pa.types.is_large_string(t)
+    return (numeric(left) and numeric(right)) or (text(left) and text(right))
+
+def _arrow_range_mask(series: pd.Series, min_val, max_val) -> np.ndarray:
+    """Inclusive range mask computed with Arrow comparison kernels"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Compare each decoded category once, then look the result up by code; missing (-1) reads the trailing False
+        categories = series.cat.categories
+        category_mask = _arrow_range_mask(pd.Series(categories), min_val, max_val) if len(categories) else np.empty(0, dtype=bool)
+        return np.append(category_mask, False)[series.cat.codes.to_numpy()]
+    
+    column = pa.array(series, from_pandas=True)
+    mask = pc.and_(pc.greater_equal(column, min_val), pc.less_equal(column, max_val))
+    return pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+
+# Filters are applied from cheapest to most expensive predicate
+FILTER_COST_ORDER = {'equals': 0, 'in': 1, 'range': 2, 'contains': 3}
+
+# Maximum distinct values kept per text column for filter widgets
+UNIQUE_VALUES_CAP = 10_000
+
+def _frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """Shape, columns, dtypes and a content hash, recomputed on every call so in-place edits are seen"""
+    try:
+        hashed = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # Unhashable cell values (lists, dicts); hash their string form instead
+        hashed = pd.util.hash_pandas_object(df.astype(str), index=True)
+    return (df.shape, tuple(df.columns), tuple(df.dtypes.astype(str)), int(hashed.sum()))
+
+# Cache per-frame results on content, so equal frames share entries and a reused id never serves stale data
+_FRAME_FINGERPRINT = {pd.DataFrame: _frame_fingerprint}
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def column_kinds(data: pd.DataFrame) -> Dict[str, List[str]]:
+    """Numeric and categorical column names, resolved once per DataFrame"""
+    return {
+        'numeric': data.select_dtypes(include=[np.number]).columns.tolist(),
+        'categorical': data.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
+    }
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _memory_usage_kb(data: pd.DataFrame) -> float:
+    """Deep memory footprint in KB, computed once per loaded DataFrame"""
+    return float(data.memory_usage(deep=True).sum()) / 1024
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _column_metadata(data: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Compute per-column filter metadata once per loaded DataFrame"""
+    metadata = {}
+    for column, series in data.items():
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            metadata[column] = {
+                'kind': 'num',
+                'uniques': None,
+                'min': float(series.min()),
+                'max': float(series.max())
+            }
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            metadata[column] = {
+                'kind': 'str',
+                'uniques': series.cat.categories.to_numpy()[:UNIQUE_VALUES_CAP],
+                'min': None,
+                'max': None
+            }
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            metadata[column] = {
+                'kind': 'str',
+                'uniques': series.dropna().unique()[:UNIQUE_VALUES_CAP],
+                'min': None,
+                'max': None
+            }
+        else:
+            metadata[column] = {'kind': 'other', 'uniques': None, 'min': None, 'max': None}
+    return metadata
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _data_quality_report(data: pd.DataFrame) -> Dict[str, Any]:
+    """Build the data quality report once per loaded DataFrame"""
+    report = {}
+    
+    # Missing values and data types, returned together so callers need not re-derive dtypes
+    report['missing_values'] = data.isna().sum()
+    report['data_types'] = data.dtypes
+    
+    # Display-ready missing value table built from the count array in one vectorized pass
+    missing_counts = report['missing_values'].to_numpy()
+    report['missing_table'] = pd.DataFrame({
+        'Column': report['missing_values'].index,
+        'Missing Count': missing_counts,
+        'Missing %': np.round(missing_counts * (100.0 / max(len(data), 1)), 2)
+    })
+    
+    # Duplicate rows
+    report['duplicate_rows'] = data.duplicated().sum()
+    
+    # Unique values per column
+    report['unique_values'] = data.nunique()
+    
+    # Memory usage
+    report['memory_usage'] = data.memory_usage(deep=True)
+    
+    # Numeric and categorical columns statistics
+    kinds = column_kinds(data)
+    numeric_cols = kinds['numeric']
+    report['numeric_columns'] = len(numeric_cols)
+    report['categorical_columns'] = len(kinds['categorical'])
+    
+    # Outliers detection (using IQR method), over all numeric columns in one array pass
+    outliers_count = dict.fromkeys(numeric_cols, 0)
+    if numeric_cols and len(data):
+        values = data[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        with warnings.catch_warnings():
+            # All-missing columns have no quartiles and count no outliers
+            warnings.simplefilter('ignore', RuntimeWarning)
+            Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        counts = np.count_nonzero((values < lower_bound) | (values > upper_bound), axis=0)
+        outliers_count.update(zip(numeric_cols, counts.tolist()))
+    
+    report['outliers'] = outliers_count
+    
+    return report
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _summary_statistics(data: pd.DataFrame) -> pd.DataFrame:
+    """describe() plus median, mode and higher moments, computed once per DataFrame"""
+    numeric_data = data[column_kinds(data)['numeric']]
+    
+    if numeric_data.empty:
+        return pd.DataFrame()
+    
+    summary = numeric_data.describe()
+    
+    # Add additional statistics as rows, one reduction call for the moments
+    additional_stats = numeric_data.agg(['median', 'var', 'skew', 'kurt']).rename(
+        index={'var': 'variance', 'skew': 'skewness', 'kurt': 'kurtosis'}
+    )
+    modes = numeric_data.mode()
+    first_modes = modes.iloc[0] if len(modes) > 0 else pd.Series(np.nan, index=numeric_data.columns)
+    additional_stats = pd.concat([
+        additional_stats.loc[['median']],
+        first_modes.to_frame('mode').T,
+        additional_stats.loc[['variance', 'skewness', 'kurtosis']]
+    ])
+    
+    # Combine with describe() output
+    summary = pd.concat([summary, additional_stats])
+    
+    return summary.round(3)
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _column_info(data: pd.DataFrame, column: str) -> Dict[str, Any]:
+    """Detailed statistics for one column, computed once per DataFrame and column"""
+    col_data = data[column]
+    info = {
+        'name': column,
+        'dtype': str(col_data.dtype),
+        'non_null_count': col_data.count(),
+        'null_count': col_data.isnull().sum(),
+        'unique_count': col_data.nunique(),
+        'memory_usage': col_data.memory_usage(deep=True)
+    }
+    
+    # Add type-specific information
+    if pd.api.types.is_numeric_dtype(col_data) and not pd.api.types.is_bool_dtype(col_data):
+        info.update({
+            'min': col_data.min(),
+            'max': col_data.max(),
+            'mean': col_data.mean(),
+            'median': col_data.median(),
+            'std': col_data.std()
+        })
+    elif col_data.dtype == 'object' or isinstance(col_data.dtype, pd.CategoricalDtype):
+        info.update({
+            'most_frequent': col_data.mode().iloc[0] if len(col_data.mode()) > 0 else None,
+            'avg_length': col_data.astype(str).str.len().mean()
+        })
+    
+    return info
+
+def float32_corr(numeric_data: pd.DataFrame) -> pd.DataFrame:
+    """Pearson correlation computed in float32 with one matrix product"""
+    values = numeric_data.to_numpy(dtype=np.float32, na_value=np.nan)
+    if np.isnan(values).any():
+        # Pairwise-complete correlation needs pandas' per-pair NaN handling
+        return numeric_data.corr()
+    
+    values = values - values.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', values, values))
+    norms[norms == 0] = np.nan
+    corr = (values.T @ values) / np.outer(norms, norms)
+    np.clip(corr, -1, 1, out=corr)
+    np.fill_diagonal(corr, np.where(np.isnan(norms), np.nan, 1))
+    return pd.DataFrame(corr, index=numeric_data.columns, columns=numeric_data.columns)
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_FINGERPRINT)
+def _correlation_matrix(data: pd.DataFrame, columns: tuple) -> pd.DataFrame:
+    """Pearson correlation of the given columns, computed once per DataFrame and column set"""
+    return float32_corr(data[list(columns)])
 
 class DataProcessor:
     """Handles data loading, processing, and analysis operations"""
@@ -9,28 +296,7 @@ class DataProcessor:
     def load_file(self, uploaded_file) -> pd.DataFrame:
         """Load data from uploaded file"""
         try:
-            if uploaded_file.name.endswith('.csv'):
-                # Try different encodings for CSV files
-                try:
-                    df = pd.read_csv(uploaded_file, encoding='utf-8')
-                except UnicodeDecodeError:
-                    uploaded_file.seek(0)  # Reset file pointer
-                    df = pd.read_csv(uploaded_file, encoding='latin-1')
-            
-            elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(uploaded_file)
-            
-            else:
-                raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
-            
-            # Basic data validation
-            if df.empty:
-                raise ValueError("The uploaded file is empty.")
-            
-            # Clean column names
-            df.columns = df.columns.str.strip()
-            
-            return df
+            return _parse_file(uploaded_file.getvalue(), uploaded_file.name)
             
         except Exception as e:
             raise Exception(f"Failed to load file: {str(e)}")
@@ -38,29 +304,7 @@ class DataProcessor:
     def get_summary_statistics(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate summary statistics for numeric columns"""
         try:
-            numeric_data = data.select_dtypes(include=[np.number])
-            
-            if numeric_data.empty:
-                return pd.DataFrame()
-            
-            summary = numeric_data.describe()
-            
-            # Add additional statistics
-            additional_stats = pd.DataFrame({
-                col: {
-                    'median': numeric_data[col].median(),
-                    'mode': numeric_data[col].mode().iloc[0] if len(numeric_data[col].mode()) > 0 else np.nan,
-                    'variance': numeric_data[col].var(),
-                    'skewness': numeric_data[col].skew(),
-                    'kurtosis': numeric_data[col].kurtosis()
-                }
-                for col in numeric_data.columns
-            }).T
-            
-            # Combine with describe() output
-            summary = pd.concat([summary, additional_stats])
-            
-            return summary.round(3)
+            return _summary_statistics(data)
             
         except Exception as e:
             st.error(f"Error calculating summary statistics: {str(e)}")
@@ -69,75 +313,59 @@ class DataProcessor:
     def get_data_quality_report(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Generate a comprehensive data quality report"""
         try:
-            report = {}
-            
-            # Missing values analysis
-            missing_values = data.isnull().sum()
-            report['missing_values'] = missing_values
-            
-            # Duplicate rows
-            report['duplicate_rows'] = data.duplicated().sum()
-            
-            # Data types
-            report['data_types'] = data.dtypes
-            
-            # Unique values per column
-            report['unique_values'] = data.nunique()
-            
-            # Memory usage
-            report['memory_usage'] = data.memory_usage(deep=True)
-            
-            # Numeric columns statistics
-            numeric_cols = data.select_dtypes(include=[np.number]).columns
-            report['numeric_columns'] = len(numeric_cols)
-            
-            # Categorical columns statistics
-            categorical_cols = data.select_dtypes(include=['object', 'string']).columns
-            report['categorical_columns'] = len(categorical_cols)
-            
-            # Outliers detection (using IQR method for numeric columns)
-            outliers_count = {}
-            for col in numeric_cols:
-                Q1 = data[col].quantile(0.25)
-                Q3 = data[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outliers = data[(data[col] < lower_bound) | (data[col] > upper_bound)]
-                outliers_count[col] = len(outliers)
-            
-            report['outliers'] = outliers_count
-            
-            return report
+            return _data_quality_report(data)
             
         except Exception as e:
             st.error(f"Error generating data quality report: {str(e)}")
             return {}
     
-    def filter_data(self, data: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Apply filters to the data"""
+    def filter_data(self, data: pd.DataFrame, filters: Dict[str, Any],
+                    columns: Optional[List[str]] = None, row_limit: Optional[int] = None,
+                    row_offset: int = 0) -> pd.DataFrame:
+        """Apply filters to the data, then project to columns and return one page of rows"""
         try:
-            filtered_data = data.copy()
+            # Row positions that pass every filter so far; None means all rows
+            positions = None
+            
+            # Cheap predicates first so the string scan sees the fewest rows
+            ordered_filters = sorted(
+                filters.items(),
+                key=lambda item: FILTER_COST_ORDER.get(item[1].get('type'), len(FILTER_COST_ORDER))
+            )
             
-            for column, filter_config in filters.items():
+            for column, filter_config in ordered_filters:
                 if column not in data.columns:
                     continue
                 
                 filter_type = filter_config.get('type')
                 filter_value = filter_config.get('value')
                 
+                # Each predicate reads only its own column at the surviving rows
+                series = data[column] if positions is None else data[column].iloc[positions]
+                
                 if filter_type == 'equals':
-                    filtered_data = filtered_data[filtered_data[column] == filter_value]
+                    mask = (series == filter_value).to_numpy(dtype=bool, na_value=False)
                 elif filter_type == 'contains':
-                    filtered_data = filtered_data[filtered_data[column].str.contains(filter_value, na=False)]
+                    # Literal substring search unless the filter asks for a regular expression
+                    regex = bool(filter_config.get('regex', False))
+                    mask = series.str.contains(filter_value, na=False, regex=regex).to_numpy(dtype=bool, na_value=False)
                 elif filter_type == 'range':
                     min_val, max_val = filter_value
-                    filtered_data = filtered_data[
-                        (filtered_data[column] >= min_val) & 
-                        (filtered_data[column] <= max_val)
-                    ]
+                    mask = _arrow_range_mask(series, min_val, max_val)
                 elif filter_type == 'in':
-                    filtered_data = filtered_data[filtered_data[column].isin(filter_value)]
+                    mask = _arrow_in_mask(series, filter_value)
+                else:
+                    continue
+                
+                positions = np.flatnonzero(mask) if positions is None else positions[mask]
+            
+            # Project and page before materializing, so only the displayed rows are copied
+            filtered_data = data[columns] if columns else data
+            page = slice(row_offset, None if row_limit is None else row_offset + row_limit)
+            if positions is not None:
+                filtered_data = filtered_data.iloc[positions[page]]
+            elif row_limit is not None or row_offset:
+                filtered_data = filtered_data.iloc[page]
             
             return filtered_data
             
@@ -145,38 +373,43 @@ class DataProcessor:
             st.error(f"Error filtering data: {str(e)}")
             return data
     
+    def get_correlation_matrix(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Get the cached correlation matrix of the numeric columns"""
+        try:
+            numeric_cols = tuple(column_kinds(data)['numeric'])
+            if len(numeric_cols) < 2:
+                return pd.DataFrame()
+            
+            return _correlation_matrix(data, numeric_cols)
+            
+        except Exception as e:
+            st.error(f"Error calculating correlation matrix: {str(e)}")
+            return pd.DataFrame()
+    
+    def get_memory_usage_kb(self, data: pd.DataFrame) -> float:
+        """Get the cached memory footprint of a DataFrame in KB"""
+        return _memory_usage_kb(data)
+    
+    def get_column_kinds(self, data: pd.DataFrame) -> Dict[str, List[str]]:
+        """Get cached numeric and categorical column names"""
+        return column_kinds(data)
+    
+    def get_column_metadata(self, data: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Get cached unique values and numeric bounds for building filters"""
+        try:
+            return _column_metadata(data)
+            
+        except Exception as e:
+            st.error(f"Error computing column metadata: {str(e)}")
+            return {}
+    
     def get_column_info(self, data: pd.DataFrame, column: str) -> Dict[str, Any]:
         """Get detailed information about a specific column"""
         try:
             if column not in data.columns:
                 return {}
             
-            col_data = data[column]
-            info = {
-                'name': column,
-                'dtype': str(col_data.dtype),
-                'non_null_count': col_data.count(),
-                'null_count': col_data.isnull().sum(),
-                'unique_count': col_data.nunique(),
-                'memory_usage': col_data.memory_usage(deep=True)
-            }
-            
-            # Add type-specific information
-            if col_data.dtype in ['int64', 'float64']:
-                info.update({
-                    'min': col_data.min(),
-                    'max': col_data.max(),
-                    'mean': col_data.mean(),
-                    'median': col_data.median(),
-                    'std': col_data.std()
-                })
-            elif col_data.dtype == 'object':
-                info.update({
-                    'most_frequent': col_data.mode().iloc[0] if len(col_data.mode()) > 0 else None,
-                    'avg_length': col_data.astype(str).str.len().mean()
-                })
-            
-            return info
+            return _column_info(data, column)
             
         except Exception as e:
             st.error(f"Error getting column info: {str(e)}")
@@ -11,6 +11,9 @@ import psycopg2
 class DatabaseManager:
     """Manages PostgreSQL database operations for the learning platform"""
     
+    # Bumped on every course write in this process so in-memory catalogs know to reload
+    courses_version = 0
+    
     def __init__(self):
         self.database_url = os.environ.get('DATABASE_URL')
         self.engine = None
@@ -85,6 +88,11 @@ class DatabaseManager:
                     )
                 """))
                 
+                # Per-course enrollment counts cannot use the (user_id, course_id) index
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_enrollments_course_id ON enrollments (course_id)
+                """))
+                
                 # User progress table
                 conn.execute(text("""
                     CREATE TABLE IF NOT EXISTS user_progress (
@@ -225,7 +233,31 @@ class DatabaseManager:
                    :estimated_hours, :rating, :instructor, :tags, :prerequisites, 
                    :learning_outcomes, :lessons)
         """
-        return self.execute_update(query, course_data)
+        created = self.execute_update(query, course_data)
+        if created:
+            DatabaseManager.courses_version += 1
+        return created
+    
+    def create_courses_bulk(self, courses: List[Dict[str, Any]]) -> bool:
+        """Insert many courses with one executemany and a single commit"""
+        query = """
+            INSERT INTO courses (course_id, title, description, category, difficulty, 
+                               estimated_hours, rating, instructor, tags, prerequisites, 
+                               learning_outcomes, lessons)
+            VALUES (:course_id, :title, :description, :category, :difficulty, 
+                   :estimated_hours, :rating, :instructor, :tags, :prerequisites, 
+                   :learning_outcomes, :lessons)
+        """
+        if not courses:
+            return True
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(query), courses)
+            DatabaseManager.courses_version += 1
+            return True
+        except Exception as e:
+            st.error(f"Error creating courses: {str(e)}")
+            return False
     
     def get_all_courses(self) -> List[Dict[str, Any]]:
         """Get all courses"""
@@ -238,6 +270,13 @@ class DatabaseManager:
         results = self.execute_query(query, {"course_id": course_id})
         return results[0] if results else None
     
+    def get_courses_by_ids(self, course_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get multiple courses by ID in a single query"""
+        if not course_ids:
+            return []
+        query = "SELECT * FROM courses WHERE course_id = ANY(:course_ids)"
+        return self.execute_query(query, {"course_ids": list(course_ids)})
+    
     def search_courses(self, search_term: str = "", category: str = "", difficulty: str = "") -> List[Dict[str, Any]]:
         """Search courses with filters"""
         query = "SELECT * FROM courses WHERE 1=1"
@@ -280,6 +319,21 @@ class DatabaseManager:
         results = self.execute_query(query, {"user_id": user_id})
         return [row["course_id"] for row in results]
     
+    def is_enrolled(self, user_id: str, course_id: str) -> bool:
+        """Check a single enrollment with an indexed lookup"""
+        query = """
+            SELECT 1 FROM enrollments
+            WHERE user_id = :user_id AND course_id = :course_id
+            LIMIT 1
+        """
+        return bool(self.execute_query(query, {"user_id": user_id, "course_id": course_id}))
+    
+    def count_enrollments(self, course_id: str) -> int:
+        """Number of users enrolled in a course"""
+        query = "SELECT COUNT(*) AS enrollment_count FROM enrollments WHERE course_id = :course_id"
+        results = self.execute_query(query, {"course_id": course_id})
+        return results[0]["enrollment_count"] if results else 0
+    
     def update_course_progress(self, user_id: str, course_id: str, progress: float) -> bool:
         """Update course progress percentage"""
         query = """
@@ -402,40 +456,3 @@ class DatabaseManager:
             ORDER BY created_at DESC
         """
         return self.execute_query(query, {"user_id": user_id})
-    
-    def initialize_sample_data(self) -> bool:
-        """Initialize database with sample courses if empty"""
-        try:
-            # Check if courses already exist
-            existing_courses = self.get_all_courses()
-            if existing_courses:
-                return True
-            
-            # Import sample data from course manager
-            from utils.course_manager import CourseManager
-            course_manager = CourseManager()
-            
-            # Get sample courses and save them to database
-            for course_data in course_manager.courses.values():
-                # Convert arrays to proper format for PostgreSQL
-                course_db_data = {
-                    "course_id": course_data["course_id"],
-                    "title": course_data["title"],
-                    "description": course_data["description"],
-                    "category": course_data["category"],
-                    "difficulty": course_data["difficulty"],
-                    "estimated_hours": course_data["estimated_hours"],
-                    "rating": course_data["rating"],
-                    "instructor": course_data["instructor"],
-                    "tags": course_data.get("tags", []),
-                    "prerequisites": course_data.get("prerequisites", []),
-                    "learning_outcomes": course_data.get("learning_outcomes", []),
-                    "lessons": json.dumps(course_data.get("lessons", []))
-                }
-                self.create_course(course_db_data)
-            
-            return True
-            
-        except Exception as e:
-            st.error(f"Error initializing sample data: {str(e)}")
-            return False
\ No newline at end of file
@@ -1,52 +1,125 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 import io
 import base64
-from typing import Optional, Dict, Any
+from openpyxl import Workbook
+from typing import Optional, Dict, Any, Union, Callable
 import json
+from .data_processor import column_kinds
+
+# Rows formatted and written per batch when exporting data
+EXPORT_BATCH_ROWS = 64_000
+
+# Ticks per second for each datetime64 unit
+_TICKS_PER_SECOND = {'s': 1, 'ms': 10**3, 'us': 10**6, 'ns': 10**9}
+
+def _datetime_formatter(column: pd.Series) -> Callable[[pd.Series], pd.Series]:
+    """Format batches of a datetime column the way to_csv formats the whole column.
+
+    to_csv drops the time when every value is midnight and otherwise shows only as many
+    fractional digits as the finest value needs, deciding per array; the decision is made
+    once here so every batch agrees.
+    """
+    ticks = column.dropna().to_numpy().view('i8')
+    per_second = _TICKS_PER_SECOND[column.dt.unit]
+    unit = 'D' if not (ticks % (86_400 * per_second)).any() else 's'
+    for finer_unit, step in (('ms', per_second), ('us', per_second // 10**3), ('ns', per_second // 10**6)):
+        if step and (ticks % step).any():
+            unit = finer_unit
+    
+    def format_batch(batch: pd.Series) -> pd.Series:
+        text = np.char.replace(np.datetime_as_string(batch.to_numpy(), unit=unit), 'T', ' ')
+        return pd.Series(text, index=batch.index, dtype=object).where(batch.notna())
+    
+    return format_batch
+
+def _timedelta_formatter(column: pd.Series) -> Optional[Callable[[pd.Series], pd.Series]]:
+    """Keep the long timedelta form in every batch unless the whole column is whole days"""
+    days = column.dropna().to_numpy().view('i8') % (86_400 * _TICKS_PER_SECOND[column.dt.unit])
+    if not days.any():
+        return None
+    return lambda batch: batch.map(str, na_action='ignore').astype(object)
+
+def _csv_batch_formatters(data: pd.DataFrame) -> Dict[str, Callable[[pd.Series], pd.Series]]:
+    """Per-column formatters for columns whose to_csv text depends on the rest of the column"""
+    formatters = {}
+    for name, column in data.items():
+        # Timezone-aware values are formatted one by one, so only naive datetimes need this
+        if pd.api.types.is_datetime64_dtype(column):
+            formatters[name] = _datetime_formatter(column)
+        elif pd.api.types.is_timedelta64_dtype(column):
+            formatter = _timedelta_formatter(column)
+            if formatter is not None:
+                formatters[name] = formatter
+    return formatters
+
+def _excel_rows(batch: pd.DataFrame):
+    """Rows of a batch as plain Python values, with missing values left as empty cells"""
+    values = batch.astype(object).where(batch.notna(), None)
+    return values.itertuples(index=False, name=None)
 
 class ExportManager:
     """Handles data and visualization export functionality"""
     
-    def export_data_to_csv(self, data: pd.DataFrame, filename: Optional[str] = None) -> str:
-        """Export DataFrame to CSV format"""
+    def export_data_to_csv(self, data: pd.DataFrame, filename: Optional[str] = None) -> bytes:
+        """Export DataFrame to CSV bytes, formatted and written batch by batch"""
         try:
             if filename is None:
                 filename = "exported_data.csv"
             
-            # Convert DataFrame to CSV string
-            csv_string = data.to_csv(index=False)
-            return csv_string
+            formatters = _csv_batch_formatters(data)
+            output = io.BytesIO()
+            for start in range(0, max(len(data), 1), EXPORT_BATCH_ROWS):
+                batch = data.iloc[start:start + EXPORT_BATCH_ROWS]
+                if formatters and len(batch):
+                    batch = batch.assign(**{name: format_batch(batch[name]) for name, format_batch in formatters.items()})
+                batch.to_csv(output, index=False, header=start == 0)
+            
+            return output.getvalue()
             
         except Exception as e:
             st.error(f"Error exporting data to CSV: {str(e)}")
-            return ""
+            return b""
     
     def export_data_to_excel(self, data: pd.DataFrame, filename: Optional[str] = None) -> bytes:
-        """Export DataFrame to Excel format"""
+        """Export DataFrame to Excel format, streaming rows through a write-only sheet"""
         try:
             if filename is None:
                 filename = "exported_data.xlsx"
             
-            # Create Excel file in memory
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                data.to_excel(writer, sheet_name='Data', index=False)
+            if any(isinstance(dtype, pd.DatetimeTZDtype) for dtype in data.dtypes):
+                raise ValueError("Excel does not support datetimes with timezones. Please ensure that datetimes are timezone unaware before writing to Excel.")
             
-            excel_data = output.getvalue()
-            return excel_data
+            # Write-only sheets keep finished rows out of memory
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet('Data')
+            sheet.append([str(column) for column in data.columns])
+            for start in range(0, len(data), EXPORT_BATCH_ROWS):
+                for row in _excel_rows(data.iloc[start:start + EXPORT_BATCH_ROWS]):
+                    sheet.append(row)
+            
+            output = io.BytesIO()
+            workbook.save(output)
+            return output.getvalue()
             
         except Exception as e:
             st.error(f"Error exporting data to Excel: {str(e)}")
             return b""
     
-    def export_chart_to_html(self, fig: go.Figure, filename: Optional[str] = None) -> str:
-        """Export Plotly figure to HTML format"""
+    def export_chart_to_html(self, fig: Optional[go.Figure] = None, filename: Optional[str] = None) -> str:
+        """Export Plotly figure to HTML format, defaulting to the last rendered chart"""
         try:
             if filename is None:
                 filename = "chart.html"
             
+            if fig is None:
+                fig = st.session_state.get('current_fig')
+            if fig is None:
+                st.warning("Create a chart before exporting it.")
+                return ""
+            
             # Convert figure to HTML
             html_string = fig.to_html(
                 include_plotlyjs='cdn',
@@ -63,9 +136,15 @@ class ExportManager:
             st.error(f"Error exporting chart to HTML: {str(e)}")
             return ""
     
-    def export_chart_to_json(self, fig: go.Figure) -> str:
-        """Export Plotly figure to JSON format"""
+    def export_chart_to_json(self, fig: Optional[go.Figure] = None) -> str:
+        """Export Plotly figure to JSON format, defaulting to the last rendered chart"""
         try:
+            if fig is None:
+                fig = st.session_state.get('current_fig')
+            if fig is None:
+                st.warning("Create a chart before exporting it.")
+                return ""
+            
             # Convert figure to JSON
             fig_json = fig.to_json()
             return fig_json
@@ -74,11 +153,12 @@ class ExportManager:
             st.error(f"Error exporting chart to JSON: {str(e)}")
             return ""
     
-    def create_downloadable_link(self, data: str, filename: str, mime_type: str) -> str:
+    def create_downloadable_link(self, data: Union[str, bytes], filename: str, mime_type: str) -> str:
         """Create a downloadable link for data"""
         try:
             # Encode data to base64
-            b64_data = base64.b64encode(data.encode()).decode()
+            raw_data = data if isinstance(data, bytes) else data.encode()
+            b64_data = base64.b64encode(raw_data).decode()
             
             # Create download link
             href = f'<a href="data:{mime_type};base64,{b64_data}" download="{filename}">Download {filename}</a>'
@@ -116,7 +196,8 @@ class ExportManager:
                 report_lines.append("")
             
             # Numeric columns summary
-            numeric_cols = data.select_dtypes(include=['number']).columns
+            kinds = column_kinds(data)
+            numeric_cols = kinds['numeric']
             if len(numeric_cols) > 0:
                 report_lines.append("## Numeric Columns Summary")
                 summary_stats = data[numeric_cols].describe()
@@ -128,7 +209,7 @@ class ExportManager:
                     report_lines.append("")
             
             # Categorical columns summary
-            categorical_cols = data.select_dtypes(include=['object', 'string']).columns
+            categorical_cols = kinds['categorical']
             if len(categorical_cols) > 0:
                 report_lines.append("## Categorical Columns Summary")
                 for col in categorical_cols:
@@ -0,0 +1,29 @@
+import mmap
+import os
+import orjson
+from typing import Any, Dict, Tuple
+
+# Parsed JSON stores keyed by path, reused while the file's modification time and size are unchanged
+_parsed_files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+def read_json_mapped(path: str) -> Any:
+    """Parse a JSON file straight from a read-only memory map, without a bytes copy"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def load_json_store(path: str) -> Any:
+    """Parsed contents of a JSON store, re-read only when the file changed on disk.
+
+    Instances opening the same unchanged file share one parsed object, so their in-memory
+    edits stay consistent until one of them saves and the next load parses the new file.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed_files.get(path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, read_json_mapped(path))
+        _parsed_files[path] = cached
+    return cached[1]
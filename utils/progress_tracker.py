@@ -1,51 +1,85 @@
-import json
+import atexit
+import os
+import weakref
+import orjson
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import streamlit as st
+from .json_store import load_json_store
+
+# Live trackers, flushed by one exit hook; collected trackers drop out instead of being kept alive
+_live_trackers: "weakref.WeakSet[ProgressTracker]" = weakref.WeakSet()
+
+def _flush_live_trackers():
+    """Write pending progress of every tracker still alive at interpreter exit"""
+    for tracker in list(_live_trackers):
+        tracker.flush()
+
+atexit.register(_flush_live_trackers)
 
 class ProgressTracker:
     """Handles user progress tracking and analytics"""
     
-    def __init__(self):
+    def __init__(self, course_manager=None):
+        self._course_manager = course_manager
         self.progress_file = "data/user_progress.json"
         self.achievements_file = "data/achievements.json"
         self._ensure_data_directory()
         self._load_data()
+        self._progress_dirty = False
+        _live_trackers.add(self)
         self._initialize_achievements()
     
+    def _get_course_manager(self):
+        """CourseManager shared by every call, created on first use"""
+        if self._course_manager is None:
+            from utils.course_manager import CourseManager
+            self._course_manager = CourseManager()
+        return self._course_manager
+    
     def _ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
-        import os
         if not os.path.exists("data"):
             os.makedirs("data")
     
     def _load_data(self):
         """Load progress data from JSON files"""
         try:
-            with open(self.progress_file, 'r') as f:
-                self.user_progress = json.load(f)
+            self.user_progress = load_json_store(self.progress_file)
         except FileNotFoundError:
             self.user_progress = {}
         
         try:
-            with open(self.achievements_file, 'r') as f:
-                self.achievements_data = json.load(f)
+            self.achievements_data = load_json_store(self.achievements_file)
         except FileNotFoundError:
             self.achievements_data = {}
     
-    def _save_progress(self):
-        """Save progress data to JSON file"""
+    def _save_progress(self) -> bool:
+        """Save progress data to JSON file, returning whether the write succeeded"""
         try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(self.user_progress, f, indent=2, default=str)
+            tmp_path = self.progress_file + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(self.user_progress, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, self.progress_file)
+            return True
         except Exception as e:
             st.error(f"Error saving progress: {str(e)}")
+            return False
+    
+    def _mark_progress_dirty(self):
+        """Defer the progress write until the next flush"""
+        self._progress_dirty = True
+    
+    def flush(self):
+        """Write progress data if anything changed since the last flush"""
+        if self._progress_dirty and self._save_progress():
+            self._progress_dirty = False
     
     def _save_achievements(self):
         """Save achievements data to JSON file"""
         try:
-            with open(self.achievements_file, 'w') as f:
-                json.dump(self.achievements_data, f, indent=2, default=str)
+            with open(self.achievements_file, 'wb') as f:
+                f.write(orjson.dumps(self.achievements_data, option=orjson.OPT_INDENT_2))
         except Exception as e:
             st.error(f"Error saving achievements: {str(e)}")
     
@@ -107,7 +141,7 @@ class ProgressTracker:
                 'last_activity': None,
                 'created_at': datetime.now().isoformat()
             }
-            self._save_progress()
+            self._mark_progress_dirty()
         
         return self.user_progress[user_id]
     
@@ -149,7 +183,7 @@ class ProgressTracker:
                 if new_level > progress['level']:
                     progress['level'] = new_level
                 
-                self._save_progress()
+                self._mark_progress_dirty()
                 return True
             
             return False
@@ -161,10 +195,7 @@ class ProgressTracker:
     def _update_course_progress(self, user_id: str, course_id: str):
         """Update progress percentage for a course"""
         try:
-            from utils.course_manager import CourseManager
-            course_manager = CourseManager()
-            
-            lessons = course_manager.get_course_lessons(course_id)
+            lessons = self._get_course_manager().get_course_lessons(course_id)
             if not lessons:
                 return
             
@@ -200,7 +231,7 @@ class ProgressTracker:
                 if len(progress['enrolled_courses']) == 1:
                     self._award_achievement(user_id, 'first_course')
                 
-                self._save_progress()
+                self._mark_progress_dirty()
                 return True
             
             return False
@@ -228,7 +259,7 @@ class ProgressTracker:
             # Update streak
             self._update_learning_streak(user_id)
             
-            self._save_progress()
+            self._mark_progress_dirty()
             
         except Exception as e:
             st.error(f"Error updating daily activity: {str(e)}")
@@ -319,7 +350,7 @@ class ProgressTracker:
             progress['total_points'] += achievement_def['points']
             
             self._save_achievements()
-            self._save_progress()
+            self._mark_progress_dirty()
             
             return True
             
@@ -410,7 +441,7 @@ class ProgressTracker:
             if len(high_scores) >= 5:
                 self._award_achievement(user_id, 'quiz_master')
             
-            self._save_progress()
+            self._mark_progress_dirty()
             
         except Exception as e:
             st.error(f"Error recording quiz result: {str(e)}")
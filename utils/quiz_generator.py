@@ -1,51 +1,58 @@
-import json
+import os
+import orjson
 import uuid
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import streamlit as st
+from .json_store import load_json_store
 
 class QuizGenerator:
     """Handles AI-powered quiz generation and management"""
     
-    def __init__(self):
+    def __init__(self, progress_tracker=None):
+        self._progress_tracker = progress_tracker
         self.quizzes_file = "data/quizzes.json"
         self.quiz_results_file = "data/quiz_results.json"
         self._ensure_data_directory()
         self._load_data()
     
+    def _get_progress_tracker(self):
+        """ProgressTracker shared by every call, created on first use"""
+        if self._progress_tracker is None:
+            from utils.progress_tracker import ProgressTracker
+            self._progress_tracker = ProgressTracker()
+        return self._progress_tracker
+    
     def _ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
-        import os
         if not os.path.exists("data"):
             os.makedirs("data")
     
     def _load_data(self):
         """Load quiz data from JSON files"""
         try:
-            with open(self.quizzes_file, 'r') as f:
-                self.quizzes = json.load(f)
+            self.quizzes = load_json_store(self.quizzes_file)
         except FileNotFoundError:
             self.quizzes = {}
         
         try:
-            with open(self.quiz_results_file, 'r') as f:
-                self.quiz_results = json.load(f)
+            self.quiz_results = load_json_store(self.quiz_results_file)
         except FileNotFoundError:
             self.quiz_results = {}
     
     def _save_quizzes(self):
         """Save quizzes to JSON file"""
         try:
-            with open(self.quizzes_file, 'w') as f:
-                json.dump(self.quizzes, f, indent=2, default=str)
+            with open(self.quizzes_file, 'wb') as f:
+                f.write(orjson.dumps(self.quizzes, option=orjson.OPT_INDENT_2, default=str))
         except Exception as e:
             st.error(f"Error saving quizzes: {str(e)}")
     
     def _save_quiz_results(self):
         """Save quiz results to JSON file"""
         try:
-            with open(self.quiz_results_file, 'w') as f:
-                json.dump(self.quiz_results, f, indent=2, default=str)
+            with open(self.quiz_results_file, 'wb') as f:
+                f.write(orjson.dumps(self.quiz_results, option=orjson.OPT_INDENT_2, default=str))
         except Exception as e:
             st.error(f"Error saving quiz results: {str(e)}")
     
@@ -93,10 +100,10 @@ class QuizGenerator:
                 temperature=0.7
             )
             
-            quiz_data = json.loads(response.choices[0].message.content)
+            quiz_data = orjson.loads(response.choices[0].message.content)
             
             # Add metadata
-            quiz_id = str(uuid.uuid4())
+            quiz_id = uuid.uuid4().hex
             quiz = {
                 'quiz_id': quiz_id,
                 'topic': topic,
@@ -151,7 +158,7 @@ class QuizGenerator:
     
     def _generate_template_quiz(self, topic: str, difficulty: str, num_questions: int, quiz_type: str) -> Dict[str, Any]:
         """Generate quiz using predefined templates"""
-        quiz_id = str(uuid.uuid4())
+        quiz_id = uuid.uuid4().hex
         
         # Template questions based on common topics
         template_questions = self._get_template_questions(topic.lower(), difficulty.lower())
@@ -348,10 +355,10 @@ class QuizGenerator:
             self.quiz_results[user_id].append(result)
             self._save_quiz_results()
             
-            # Record in progress tracker
-            from utils.progress_tracker import ProgressTracker
-            progress_tracker = ProgressTracker()
+            # Record in progress tracker and write it now rather than at exit
+            progress_tracker = self._get_progress_tracker()
             progress_tracker.record_quiz_result(user_id, quiz['topic'], score['percentage'])
+            progress_tracker.flush()
             
         except Exception as e:
             st.error(f"Error saving quiz result: {str(e)}")